@@ -6,12 +6,15 @@ class NumberGuessingGame:
     def __init__(self, root):
         self.root = root
         self.root.title("Number Guessing Game")
-        self.root.geometry("400x380")
+        self.root.geometry("400x420")
         self.root.resizable(False, False)
 
         self.difficulty = tk.StringVar(value="Medium")
         self.number_to_guess = None
         self.attempts = 0
+        self.finished = False
+        self.stats = None
+        self.stats_panel = None
 
         self.setup_ui()
         self.set_difficulty()  # Initialize game
@@ -54,6 +57,9 @@ class NumberGuessingGame:
         self.restart_btn = ttk.Button(self.root, text="Restart Game", command=self.restart_game)
         self.restart_btn.pack(pady=10)
 
+        self.stats_btn = ttk.Button(self.root, text="Statistics", command=self.show_stats)
+        self.stats_btn.pack()
+
     def set_difficulty(self):
         level = self.difficulty.get()
         if level == "Easy":
@@ -65,6 +71,7 @@ class NumberGuessingGame:
 
         self.number_to_guess = random.randint(1, self.range_max)
         self.attempts = 0
+        self.finished = False
         self.attempt_label.config(text="Attempts: 0")
         self.result_label.config(text=f"(Guess a number from 1 to {self.range_max})")
         self.entry.delete(0, tk.END)
@@ -87,10 +94,29 @@ class NumberGuessingGame:
             self.result_label.config(text="Too high. Try again.")
         else:
             self.result_label.config(text=f"🎉 Correct! It was {self.number_to_guess}.")
+            if not self.finished:
+                self.finished = True
+                self.open_stats().record(self.difficulty.get(), self.attempts)
+                if self.stats_panel is not None and self.stats_panel.winfo_exists():
+                    self.stats_panel.refresh()
 
     def restart_game(self):
         self.set_difficulty()
 
+    def open_stats(self):
+        # The database is opened on first use, not at startup
+        if self.stats is None:
+            from guess_stats import GameStats
+            self.stats = GameStats()
+        return self.stats
+
+    def show_stats(self):
+        if self.stats_panel is not None and self.stats_panel.winfo_exists():
+            self.stats_panel.lift()
+            return
+        from guess_stats_panel import StatsPanel
+        self.stats_panel = StatsPanel(self.root, self.open_stats(), self.difficulty.get())
+
 if __name__ == "__main__":
     root = tk.Tk()
     app = NumberGuessingGame(root)
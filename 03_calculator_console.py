@@ -1,15 +1,46 @@
-import math
+import sys
+from calc_engine import MODES, default_engine, evaluate
+from calc_history import History
 
 def evaluate_expression(expression):
     try:
-        allowed_names = {name: getattr(math, name) for name in dir(math) if not name.startswith("__")}
-        allowed_names.update({"abs": abs, "round": round}) 
-
-        result = eval(expression, {"__builtins__": None}, allowed_names)
-        return result
+        # Formatting fails too, e.g. ints past the int-to-str digit limit
+        return str(evaluate(expression))
     except Exception as e:
         return f"Error: {str(e)}"
 
+def tabulate_command(args):
+    parts = args.rsplit(maxsplit=3)
+    if len(parts) != 4:
+        print("Usage: tab <expr in x> <start> <stop> <count>")
+        return
+    try:
+        # NumPy is only needed for tabulation, so keep it out of startup
+        from calc_tabulate import parse_range, write_table
+        write_table(parts[0], parse_range(*parts[1:]))
+    except Exception as e:
+        print(f"Error: {str(e)}")
+
+def mode_command(args):
+    parts = args.split()
+    if not parts:
+        print(f"Mode: {default_engine.mode} (decimal precision {default_engine.precision})")
+        return
+    try:
+        precision = int(parts[1]) if len(parts) > 1 else None
+        default_engine.set_mode(parts[0].lower(), precision)
+        print(f"Mode set to {default_engine.mode}")
+    except ValueError as e:
+        print(f"Error: {str(e)}")
+
+def history_command(history, args):
+    args = args.strip()
+    entries = history.search(args) if args else history.recent()
+    if not entries:
+        print("No matching history.")
+    for n, expression, result in entries:
+        print(f" !{n}  {expression} = {result}")
+
 def show_help():
     print("\n📘 Supported Operations:")
     print(" Basic: +  -  *  /  **  %")
@@ -20,11 +51,17 @@ def show_help():
     print(" Roots: sqrt(x)")
     print(" Constants: pi, e, tau")
     print(" Example: sin(pi/2) + log10(100) * sqrt(16)")
+    print(" History: history [text] to list or search, !n to re-run entry n")
+    print(f" Precision: mode [{'|'.join(MODES)}] [digits]")
+    print("      e.g. mode exact  (0.1+0.2 = 3/10), mode decimal 50")
+    print(" Tabulate: tab <expr in x> <start> <stop> <count>")
+    print("      e.g. tab sin(x)*exp(-x) 0 10 1000")
     print(" Type 'help' to see this again, or 'exit' to quit.\n")
 
 def main():
     print("🧮 Scientific Calculator (Console Version)")
     print("Type 'help' to see supported operations. Type 'exit' to quit.\n")
+    history = History()
 
     while True:
         expression = input(">>> ")
@@ -36,9 +73,30 @@ def main():
             show_help()
         elif expression.strip() == "":
             continue
+        elif expression.lower().split()[0] == 'mode':
+            mode_command(expression.strip()[4:])
+        elif expression.lower().startswith('tab '):
+            tabulate_command(expression[4:])
+        elif expression.lower().split()[0] == 'history':
+            history_command(history, expression.strip()[7:])
         else:
+            if expression.startswith('!') and expression[1:].strip().isdigit():
+                try:
+                    expression = history.get(int(expression[1:]))[0]
+                except IndexError as e:
+                    print(f"Error: {str(e)}")
+                    continue
+                print(expression)
             result = evaluate_expression(expression)
             print(f"= {result}")
+            try:
+                history.append(expression, result)
+            except OSError as e:
+                print(f"Error: history not saved: {str(e)}")
 
 if __name__ == "__main__":
+    if sys.argv[1:2] == ["--batch"]:
+        # e.g. python 03_calculator_console.py --batch [-j WORKERS] [FILE|-] < exprs.txt
+        from calc_batch import main as batch_main
+        sys.exit(batch_main(sys.argv[2:]))
     main()
@@ -1,18 +1,35 @@
 import tkinter as tk
 from tkinter import ttk
 import math
+from calc_display import EntryDisplay
+from calc_worker import BackgroundEvaluator
+
+def evaluate(expression):
+    # The engine (ast, decimal, fractions) is imported on the first calculation, not at startup
+    from calc_engine import evaluate
+    return evaluate(expression)
+
+def tokenize_text(expression):
+    from calc_tokens import tokenize
+    return tokenize(expression, implicit=False)
 
 class ScientificCalculator:
     def __init__(self, root):
         self.root = root
         self.root.title("Scientific Calculator")
-        self.root.geometry("500x580")
+        self.root.geometry("500x610")
         self.root.resizable(False, False)
 
         self.expression = ""
         self.just_evaluated = False
+        # The history log and the preview are created on first use
+        self.history = None
+        self.history_panel = None
+        self.preview = None
+        self.evaluator = BackgroundEvaluator(self.root, lambda expr: str(evaluate(expr)))
 
         self.setup_styles()
+        self.create_menu()
         self.create_widgets()
 
     def setup_styles(self):
@@ -33,9 +50,65 @@ class ScientificCalculator:
 
         style.configure('TEntry', font=('Arial', 20))
 
+    def create_menu(self):
+        # The engine starts in float mode; reading it from the engine would import it
+        self.mode_var = tk.StringVar(value="float")
+        menubar = tk.Menu(self.root)
+        # Items are added the first time the menu is opened, not at startup
+        self.mode_menu = tk.Menu(menubar, tearoff=0, postcommand=self.fill_mode_menu)
+        menubar.add_cascade(label="Precision", menu=self.mode_menu)
+        menubar.add_command(label="History", command=self.show_history)
+        self.root.config(menu=menubar)
+
+    def fill_mode_menu(self):
+        if self.mode_menu.index(tk.END) is not None:
+            return
+        from calc_engine import default_engine
+        mode_menu = self.mode_menu
+        mode_menu.add_radiobutton(label="Float", variable=self.mode_var, value="float", command=self.change_mode)
+        mode_menu.add_radiobutton(label="Exact (fractions)", variable=self.mode_var, value="exact", command=self.change_mode)
+        mode_menu.add_radiobutton(label=f"Decimal ({default_engine.precision} digits)", variable=self.mode_var,
+                                  value="decimal", command=self.change_mode)
+
+    def open_history(self):
+        if self.history is None:
+            from calc_history import History
+            self.history = History()
+        return self.history
+
+    def open_preview(self):
+        if self.preview is None:
+            from calc_engine import default_engine
+            from calc_preview import LivePreview
+            self.preview = LivePreview(self.root, self.preview_label, default_engine, tokenize=tokenize_text)
+        return self.preview
+
+    def show_history(self):
+        if self.history_panel is not None and self.history_panel.winfo_exists():
+            self.history_panel.lift()
+            return
+        from calc_history_panel import HistoryPanel
+        self.history_panel = HistoryPanel(self.root, self.open_history(), self.use_history_entry)
+
+    def use_history_entry(self, expression):
+        self.expression = expression
+        self.just_evaluated = False
+        self.display.update(self.expression)
+        self.open_preview().schedule(self.expression)
+
+    def change_mode(self):
+        from calc_engine import default_engine
+        default_engine.set_mode(self.mode_var.get())
+        self.open_preview().schedule(self.expression)
+
     def create_widgets(self):
         self.entry = ttk.Entry(self.root, justify="right", style='TEntry')
-        self.entry.pack(fill=tk.X, ipadx=8, ipady=15, padx=10, pady=10)
+        self.entry.pack(fill=tk.X, ipadx=8, ipady=15, padx=10, pady=(10, 0))
+        self.display = EntryDisplay(self.entry)
+
+        # Live result preview while typing
+        self.preview_label = ttk.Label(self.root, text="", anchor="e", font=('Arial', 12))
+        self.preview_label.pack(fill=tk.X, padx=14)
 
         btn_frame = ttk.Frame(self.root)
         btn_frame.pack(padx=10, pady=10, fill=tk.BOTH, expand=True)
@@ -78,6 +151,11 @@ class ScientificCalculator:
         operators = ['/', '*', '-', '+', '**', '^', '%']
         functions = ['sqrt', 'log', 'log10', 'sin', 'cos', 'tan', 'rad', 'deg', 'deg(x)', 'rad(x)']
 
+        # Any new input supersedes a calculation that is still running
+        if self.evaluator.busy:
+            self.evaluator.cancel()
+            self.set_busy(False)
+
         if char == 'clr':
             self.expression = ""
             self.just_evaluated = False
@@ -90,23 +168,18 @@ class ScientificCalculator:
         elif char == '=':
             self.evaluate_expression()
             return
-        elif char == 'pi':
-            self.expression = str(math.pi) if self.just_evaluated else self.expression + str(math.pi)
-            self.just_evaluated = False
-        elif char == 'e':
-            self.expression = str(math.e) if self.just_evaluated else self.expression + str(math.e)
-            self.just_evaluated = False
-        elif char == 'tau':
-            self.expression = str(math.tau) if self.just_evaluated else self.expression + str(math.tau)
+        elif char in ('pi', 'e', 'tau'):
+            # Insert the name; the engine folds it to its value once per expression
+            self.expression = char if self.just_evaluated else self.expression + char
             self.just_evaluated = False
         elif char == '^':
             self.expression += '**'
             self.just_evaluated = False
         elif char in functions:
             if char == 'deg(x)':
-                self.expression += "math.degrees("
+                self.expression += "degrees("
             elif char == 'rad(x)':
-                self.expression += "math.radians("
+                self.expression += "radians("
             else:
                 self.expression += f"{char}("
             self.just_evaluated = False
@@ -117,20 +190,28 @@ class ScientificCalculator:
                 self.expression += char
             self.just_evaluated = False
 
-        self.entry.delete(0, tk.END)
-        self.entry.insert(0, self.expression)
+        self.display.update(self.expression)
+        self.open_preview().schedule(self.expression)
 
     def evaluate_expression(self):
-        try:
-            allowed_names = {k: v for k, v in math.__dict__.items() if not k.startswith("__")}
-            allowed_names.update({"abs": abs, "round": round})
-            result = eval(self.expression, {"__builtins__": None}, allowed_names)
-            self.expression = str(result)
-        except Exception:
-            self.expression = "Error"
+        if self.preview is not None:
+            self.preview.clear()
+        self.set_busy(True)
+        self.evaluator.submit(self.expression,
+                              lambda result, error, expr=self.expression: self.show_result(expr, result, error))
+
+    def show_result(self, expression, result, error):
+        self.set_busy(False)
+        self.expression = "Error" if error else result
+        self.open_history().append(expression, self.expression)
+        if self.history_panel is not None and self.history_panel.winfo_exists():
+            self.history_panel.refresh()
         self.just_evaluated = True
-        self.entry.delete(0, tk.END)
-        self.entry.insert(0, self.expression)
+        self.display.update(self.expression)
+
+    def set_busy(self, busy):
+        self.root.config(cursor="watch" if busy else "")
+        self.entry.state(['disabled'] if busy else ['!disabled'])
 
 
 if __name__ == "__main__":
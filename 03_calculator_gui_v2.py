@@ -1,6 +1,46 @@
+import sys
 import tkinter as tk
 from math import sin, cos, tan, log, log10, sqrt, degrees, radians, pi, e, tau
-import re
+from calc_display import EntryDisplay
+from calc_worker import BackgroundEvaluator
+
+def create_key_items(canvas, x, y, w, h, text, shape, prefix=""):
+    # Shadows, face and label are tagged prefix+role so they can be recolored later
+    if shape == "circle":
+        # Outer shadows
+        canvas.create_oval(x+8, y+8, x+w, y+h, outline='', tags=prefix + "shadow_br")
+        canvas.create_oval(x, y, x+w-8, y+h-8, outline='', tags=prefix + "shadow_tl")
+
+        # Main circle colored button
+        canvas.create_oval(x+4, y+4, x+w-4, y+h-4, outline='', tags=prefix + "face")
+    else:
+        # Rounded rectangle for '=' button
+        r = 20
+        def rounded_rect(x1, y1, x2, y2, r, **kwargs):
+            canvas.create_arc(x1, y1, x1+2*r, y1+2*r, start=90, extent=90, style=tk.PIESLICE, **kwargs)
+            canvas.create_arc(x2-2*r, y1, x2, y1+2*r, start=0, extent=90, style=tk.PIESLICE, **kwargs)
+            canvas.create_arc(x2-2*r, y2-2*r, x2, y2, start=270, extent=90, style=tk.PIESLICE, **kwargs)
+            canvas.create_arc(x1, y2-2*r, x1+2*r, y2, start=180, extent=90, style=tk.PIESLICE, **kwargs)
+            canvas.create_rectangle(x1+r, y1, x2-r, y2, **kwargs)
+            canvas.create_rectangle(x1, y1+r, x2, y2-r, **kwargs)
+
+        rounded_rect(x+8, y+8, x+w, y+h, r, outline='', tags=prefix + "shadow_br")
+        rounded_rect(x, y, x+w-8, y+h-8, r, outline='', tags=prefix + "shadow_tl")
+        rounded_rect(x+4, y+4, x+w-4, y+h-4, r, outline='', tags=prefix + "face")
+
+    # Text
+    canvas.create_text(x + w // 2, y + h // 2, text=text, font=('Segoe UI', 16, 'bold'), tags=prefix + "label")
+
+
+def color_key_shadows(canvas, shadow_light, shadow_dark, pressed, prefix=""):
+    # Pressing swaps the light and dark shadows
+    if not pressed:
+        canvas.itemconfig(prefix + "shadow_br", fill=shadow_dark)
+        canvas.itemconfig(prefix + "shadow_tl", fill=shadow_light)
+    else:
+        canvas.itemconfig(prefix + "shadow_br", fill=shadow_light)
+        canvas.itemconfig(prefix + "shadow_tl", fill=shadow_dark)
+
 
 class NeumorphicButton(tk.Canvas):
     def __init__(self, master, text, diameter=70, fill_color="#e0e0e0", text_color="#333333",
@@ -25,72 +65,172 @@ class NeumorphicButton(tk.Canvas):
         self._draw_button()
 
     def _draw_button(self):
-        self.delete("all")
-        w, h = self.winfo_reqwidth(), self.winfo_reqheight()
-        if self.shape == "circle":
-            # Outer shadows
-            if not self.pressed:
-                self.create_oval(8, 8, w, h, fill=self.shadow_dark, outline='')
-                self.create_oval(0, 0, w-8, h-8, fill=self.shadow_light, outline='')
-            else:
-                self.create_oval(8, 8, w, h, fill=self.shadow_light, outline='')
-                self.create_oval(0, 0, w-8, h-8, fill=self.shadow_dark, outline='')
+        # Items are created once and tagged; presses and theme changes only recolor them
+        create_key_items(self, 0, 0, self.winfo_reqwidth(), self.winfo_reqheight(), self.text, self.shape)
+        self.update_colors()
 
-            # Main circle colored button
-            self.create_oval(4, 4, w-4, h-4, fill=self.fill_color, outline='')
-        else:
-            # Rounded rectangle for '=' button
-            r = 20
-            def rounded_rect(x1, y1, x2, y2, r, **kwargs):
-                self.create_arc(x1, y1, x1+2*r, y1+2*r, start=90, extent=90, style=tk.PIESLICE, **kwargs)
-                self.create_arc(x2-2*r, y1, x2, y1+2*r, start=0, extent=90, style=tk.PIESLICE, **kwargs)
-                self.create_arc(x2-2*r, y2-2*r, x2, y2, start=270, extent=90, style=tk.PIESLICE, **kwargs)
-                self.create_arc(x1, y2-2*r, x1+2*r, y2, start=180, extent=90, style=tk.PIESLICE, **kwargs)
-                self.create_rectangle(x1+r, y1, x2-r, y2, **kwargs)
-                self.create_rectangle(x1, y1+r, x2, y2-r, **kwargs)
-
-            if not self.pressed:
-                rounded_rect(8, 8, w, h, r, fill=self.shadow_dark, outline='')
-                rounded_rect(0, 0, w-8, h-8, r, fill=self.shadow_light, outline='')
-            else:
-                rounded_rect(8, 8, w, h, r, fill=self.shadow_light, outline='')
-                rounded_rect(0, 0, w-8, h-8, r, fill=self.shadow_dark, outline='')
+    def update_colors(self):
+        self.itemconfig("face", fill=self.fill_color)
+        self.itemconfig("label", fill=self.text_color)
+        self._draw_shadows()
 
-            rounded_rect(4, 4, w-4, h-4, r, fill=self.fill_color, outline='')
-
-        # Text
-        self.create_text(w // 2, h // 2, text=self.text, fill=self.text_color, font=('Segoe UI', 16, 'bold'))
+    def _draw_shadows(self):
+        color_key_shadows(self, self.shadow_light, self.shadow_dark, self.pressed)
 
     def _on_press(self, event):
         self.pressed = True
-        self._draw_button()
+        self._draw_shadows()
 
     def _on_release(self, event):
         self.pressed = False
-        self._draw_button()
+        self._draw_shadows()
         if self.command:
             self.command(self.text)
 
 
+class NeumorphicKeypad(tk.Canvas):
+    """The whole keypad drawn on one canvas, one tagged item group per key.
+
+    Clicks are mapped to keys by grid arithmetic on the event coordinates, and
+    command(label) is called on release just like NeumorphicButton. Repeated
+    labels next to each other in a row make one wider, rounded key.
+    """
+
+    def __init__(self, master, layout, colors, key_size=70, padding=10,
+                 shadow_light="#ffffff", shadow_dark="#a3b1c6", command=None):
+        super().__init__(master, highlightthickness=0, bg=master['bg'])
+        self.colors = colors
+        self.pitch = key_size + padding
+        self.shadow_light = shadow_light
+        self.shadow_dark = shadow_dark
+        self.command = command
+        self.labels = []
+        self.cells = {}
+        self.pressed = None
+
+        for r, row in enumerate(layout):
+            c = 0
+            while c < len(row):
+                span = 1
+                while c + span < len(row) and row[c + span] == row[c]:
+                    span += 1
+                key = len(self.labels)
+                self.labels.append(row[c])
+                width = key_size * span + padding * (span - 1)
+                create_key_items(self, c * self.pitch, r * self.pitch, width, key_size, row[c],
+                                 "rounded_rect" if span > 1 else "circle", prefix=f"k{key}.")
+                for i in range(span):
+                    self.cells[r, c + i] = key
+                c += span
+        self.key_size = key_size
+        self.update_colors()
+
+        self.bind("<ButtonPress-1>", self._on_press)
+        self.bind("<ButtonRelease-1>", self._on_release)
+
+    def update_colors(self):
+        for key, label in enumerate(self.labels):
+            fill, fg = self.colors(label)
+            self.itemconfig(f"k{key}.face", fill=fill)
+            self.itemconfig(f"k{key}.label", fill=fg)
+            color_key_shadows(self, self.shadow_light, self.shadow_dark, key == self.pressed, prefix=f"k{key}.")
+
+    def key_at(self, x, y):
+        r, dy = divmod(int(y), self.pitch)
+        c, dx = divmod(int(x), self.pitch)
+        key = self.cells.get((r, c))
+        # The gap below a key never belongs to it; the gap inside a wide key does
+        if key is None or dy >= self.key_size or (dx >= self.key_size and self.cells.get((r, c + 1)) != key):
+            return None
+        return key
+
+    def _on_press(self, event):
+        self.pressed = self.key_at(event.x, event.y)
+        if self.pressed is not None:
+            color_key_shadows(self, self.shadow_light, self.shadow_dark, True, prefix=f"k{self.pressed}.")
+
+    def _on_release(self, event):
+        key, self.pressed = self.pressed, None
+        if key is not None:
+            color_key_shadows(self, self.shadow_light, self.shadow_dark, False, prefix=f"k{key}.")
+            if self.command:
+                self.command(self.labels[key])
+
+
+ENGINE_NAMES = {
+    'sin': sin, 'cos': cos, 'tan': tan, 'sqrt': sqrt, 'log': log, 'log10': log10,
+    'radians': radians, 'degrees': degrees, 'pi': pi, 'e': e, 'tau': tau,
+}
+functions = {name for name, value in ENGINE_NAMES.items() if callable(value)}
+engine = None
+
+
+def get_engine():
+    # The engine (ast, decimal, fractions) is imported on first use, not at startup
+    global engine
+    if engine is None:
+        from calc_engine import ExpressionEngine
+        engine = ExpressionEngine(ENGINE_NAMES)
+    return engine
+
+
 def insert_implicit_multiplication(expr):
-    # Insert * between number and '('
-    expr = re.sub(r'(\d)(\()', r'\1*\2', expr)
-    # Insert * between ')' and number
-    expr = re.sub(r'(\))(\d)', r'\1*\2', expr)
-    # Insert * between ')' and '('
-    expr = re.sub(r'(\))(\()', r'\1*\2', expr)
-    return expr
+    # Single pass: 2(, )2, )(, 2pi, )sin( all get a '*'
+    from calc_tokens import source, tokenize
+    return source(tokenize(expr, functions))
+
+
+def evaluate_display(tokens):
+    from calc_tokens import cache_key, parse
+    engine = get_engine()
+    code = engine.compile_tree(cache_key(tokens), lambda: parse(tokens))
+    return str(engine.run(code))
+
+
+# Button fill and text colors per theme, looked up through each label's category
+BUTTON_PALETTES = {
+    "light": {
+        "scientific": ("#f4a261", "#ffffff"),
+        "numbers": ("#2a9d8f", "#ffffff"),
+        "operators": ("#e76f51", "#ffffff"),
+        "special": ("#264653", "#ffffff"),
+        "equal": ("#1b4332", "#ffffff"),
+    },
+    "dark": {
+        "scientific": ("#e76f51", "#000000"),
+        "numbers": ("#2a9d8f", "#000000"),
+        "operators": ("#f4a261", "#000000"),
+        "special": ("#a8dadc", "#000000"),
+        "equal": ("#52b788", "#000000"),
+    },
+}
+BUTTON_CATEGORIES = {label: category for category, labels in {
+    "scientific": ("sqrt", "log", "sin", "cos", "tan", "rad", "deg", "pi", "e", "log10", "deg(x)", "rad(x)", "tau"),
+    "numbers": ("0", "1", "2", "3", "4", "5", "6", "7", "8", "9"),
+    "operators": ("+", "-", "*", "/", "^", "%", "(", ")"),
+    "special": ("clr", "←"),
+    "equal": ("=",),
+}.items() for label in labels}
 
 
 class Calculator(tk.Tk):
-    def __init__(self):
+    def __init__(self, single_canvas=False):
         super().__init__()
         self.title("Neumorphic Calculator")
         self.geometry("420x700")
         self.resizable(False, False)
 
         self.expression = ""
+        # One NeumorphicKeypad canvas instead of a NeumorphicButton widget per key
+        self.single_canvas = single_canvas
+        # Token stream, history log and preview are created on first use
+        self._tokens = None
         self.just_evaluated = False
+        self.history = None
+        self.history_panel = None
+        self.preview = None
+        self.plot_panel = None
+        self.evaluator = BackgroundEvaluator(self, evaluate_display)
 
         self.themes = {
             "light": {
@@ -103,6 +243,8 @@ class Calculator(tk.Tk):
             }
         }
         self.current_theme = "light"
+        self._applied_theme = self.current_theme
+        self._theme_after = None
         self.configure(bg=self.themes[self.current_theme]["bg"])
 
         self._create_menu()
@@ -110,21 +252,114 @@ class Calculator(tk.Tk):
         self._create_theme_toggle()
         self._bind_keys()
 
+    @property
+    def tokens(self):
+        if self._tokens is None:
+            from calc_tokens import TokenStream
+            self._tokens = TokenStream(functions)
+        return self._tokens
+
+    def open_history(self):
+        if self.history is None:
+            from calc_history import History
+            self.history = History()
+        return self.history
+
+    def open_preview(self):
+        if self.preview is None:
+            from calc_preview import LivePreview
+            self.preview = LivePreview(self, self.preview_label, get_engine())
+        return self.preview
+
     def _create_menu(self):
         menubar = tk.Menu(self)
-        theme_menu = tk.Menu(menubar, tearoff=0)
-        theme_menu.add_command(label="Light", command=lambda: self._change_theme("light"))
-        theme_menu.add_command(label="Dark", command=lambda: self._change_theme("dark"))
-        menubar.add_cascade(label="Theme", menu=theme_menu)
+        # Items are added the first time each menu is opened, not at startup
+        self.theme_menu = tk.Menu(menubar, tearoff=0, postcommand=self._fill_theme_menu)
+        menubar.add_cascade(label="Theme", menu=self.theme_menu)
+
+        # Engines start in float mode; reading it from the engine would import it
+        self.mode_var = tk.StringVar(value="float")
+        self.mode_menu = tk.Menu(menubar, tearoff=0, postcommand=self._fill_mode_menu)
+        menubar.add_cascade(label="Precision", menu=self.mode_menu)
+        menubar.add_command(label="History", command=self._show_history)
+        menubar.add_command(label="Plot", command=self._show_plot)
         self.config(menu=menubar)
 
+    def _fill_theme_menu(self):
+        if self.theme_menu.index(tk.END) is not None:
+            return
+        self.theme_menu.add_command(label="Light", command=lambda: self._change_theme("light"))
+        self.theme_menu.add_command(label="Dark", command=lambda: self._change_theme("dark"))
+
+    def _fill_mode_menu(self):
+        if self.mode_menu.index(tk.END) is not None:
+            return
+        mode_menu = self.mode_menu
+        mode_menu.add_radiobutton(label="Float", variable=self.mode_var, value="float", command=self._change_mode)
+        mode_menu.add_radiobutton(label="Exact (fractions)", variable=self.mode_var, value="exact",
+                                  command=self._change_mode)
+        mode_menu.add_radiobutton(label=f"Decimal ({get_engine().precision} digits)", variable=self.mode_var,
+                                  value="decimal", command=self._change_mode)
+
+    def _show_history(self):
+        if self.history_panel is not None and self.history_panel.winfo_exists():
+            self.history_panel.lift()
+            return
+        from calc_history_panel import HistoryPanel
+        self.history_panel = HistoryPanel(self, self.open_history(), self._use_history_entry)
+
+    def _show_plot(self):
+        if self.plot_panel is not None and self.plot_panel.winfo_exists():
+            self.plot_panel.lift()
+            return
+        from calc_plot import PlotPanel
+        from calc_tokens import source
+        theme = self.themes[self.current_theme]
+        self.plot_panel = PlotPanel(self, get_engine().names, source(self.tokens.snapshot()),
+                                    bg=theme["bg"], fg=theme["fg"])
+
+    def _update_plot(self):
+        if self.plot_panel is not None and self.plot_panel.winfo_exists():
+            from calc_tokens import source
+            self.plot_panel.set_expression(source(self.tokens.snapshot()))
+
+    def _set_text(self, text):
+        # Spell out the implicit '*'s so the text reads back as the same tokens
+        # ("2e5" typed as 2, e, 5 is stored as "2*e*5", not as a number)
+        from calc_tokens import source
+        self.tokens.reset(text)
+        self.tokens.reset(source(self.tokens.snapshot()))
+        self.expression = self.tokens.text
+
+    def _use_history_entry(self, expression):
+        self._set_text(expression)
+        self.just_evaluated = False
+        self._update_entry()
+        self.open_preview().schedule(self.tokens.snapshot())
+        self._update_plot()
+
+    def _change_mode(self):
+        get_engine().set_mode(self.mode_var.get())
+        self.open_preview().schedule(self.tokens.snapshot())
+
     def _change_theme(self, theme_name):
+        # Recoloring ~35 buttons is deferred to one idle pass, so rapid toggles coalesce
         self.current_theme = theme_name
+        if self._theme_after is None:
+            self._theme_after = self.after_idle(self._apply_theme)
+
+    def _apply_theme(self):
+        self._theme_after = None
+        theme_name = self.current_theme
+        if theme_name == self._applied_theme:
+            return
+        self._applied_theme = theme_name
         theme = self.themes[theme_name]
         self.configure(bg=theme["bg"])
         self.entry.config(bg=theme["bg"], fg=theme["fg"], insertbackground=theme["fg"])
+        self.preview_label.config(bg=theme["bg"], fg=theme["fg"])
         self.btn_frame.config(bg=theme["bg"])
-        self.theme_btn.config(bg=theme["bg"], fg=theme["fg"])
+        self.theme_btn.config(bg=theme["bg"], fg=theme["fg"], text=f"Theme: {theme_name.title()}")
         for label, btn in self.buttons.items():
             fill, fg = self._get_button_colors(label, theme_name)
             btn.fill_color = fill
@@ -132,50 +367,31 @@ class Calculator(tk.Tk):
             btn.shadow_light = theme["shadow_light"]
             btn.shadow_dark = theme["shadow_dark"]
             btn.config(bg=theme["bg"])
-            btn._draw_button()
+            btn.update_colors()
+        if self.single_canvas:
+            # Every key is recolored in one pass over a single widget
+            self.keypad.shadow_light = theme["shadow_light"]
+            self.keypad.shadow_dark = theme["shadow_dark"]
+            self.keypad.config(bg=theme["bg"])
+            self.keypad.update_colors()
 
     def _get_button_colors(self, label, theme_name):
-        if theme_name == "light":
-            colors = {
-                "scientific": ("#f4a261", "#ffffff"),
-                "numbers": ("#2a9d8f", "#ffffff"),
-                "operators": ("#e76f51", "#ffffff"),
-                "special": ("#264653", "#ffffff"),
-                "equal": ("#1b4332", "#ffffff"),
-            }
-        else:
-            colors = {
-                "scientific": ("#e76f51", "#000000"),
-                "numbers": ("#2a9d8f", "#000000"),
-                "operators": ("#f4a261", "#000000"),
-                "special": ("#a8dadc", "#000000"),
-                "equal": ("#52b788", "#000000"),
-            }
-
-        scientific = {"sqrt", "log", "sin", "cos", "tan", "rad", "deg", "pi", "e", "log10", "deg(x)", "rad(x)", "tau"}
-        numbers = {"0","1","2","3","4","5","6","7","8","9"}
-        operators = {"+", "-", "*", "/", "^", "%", "(", ")"}
-        special = {"clr", "←"}
-        equal = {"="}
-
-        if label in scientific:
-            return colors["scientific"]
-        elif label in numbers:
-            return colors["numbers"]
-        elif label in operators:
-            return colors["operators"]
-        elif label in special:
-            return colors["special"]
-        elif label in equal:
-            return colors["equal"]
-        else:
-            return (self.themes[self.current_theme]["bg"], self.themes[self.current_theme]["fg"])
+        category = BUTTON_CATEGORIES.get(label)
+        if category is None:
+            return (self.themes[theme_name]["bg"], self.themes[theme_name]["fg"])
+        return BUTTON_PALETTES[theme_name][category]
 
     def _create_widgets(self):
         theme = self.themes[self.current_theme]
         self.entry = tk.Entry(self, font=('Segoe UI', 24), bd=0, justify='right',
                               bg=theme["bg"], fg=theme["fg"], insertbackground=theme["fg"])
         self.entry.place(x=10, y=20, width=400, height=50)
+        self.display = EntryDisplay(self.entry)
+
+        # Live result preview while typing
+        self.preview_label = tk.Label(self, text="", font=('Segoe UI', 12), anchor='e',
+                                      bg=theme["bg"], fg=theme["fg"])
+        self.preview_label.place(x=10, y=72, width=400, height=30)
 
         layout = [
             ["sqrt", "log", "sin", "cos", "tan"],
@@ -196,6 +412,16 @@ class Calculator(tk.Tk):
 
         self.buttons = {}
 
+        if self.single_canvas:
+            self.keypad = NeumorphicKeypad(
+                self.btn_frame, layout, lambda label: self._get_button_colors(label, self.current_theme),
+                key_size=btn_h, padding=padding,
+                shadow_light=theme["shadow_light"], shadow_dark=theme["shadow_dark"],
+                command=self._on_button_click
+            )
+            self.keypad.place(x=0, y=0, relwidth=1, relheight=1)
+            return
+
         for r, row in enumerate(layout):
             for c, label in enumerate(row):
                 shape = 'circle'
@@ -232,68 +458,88 @@ class Calculator(tk.Tk):
         self.theme_btn.place(x=150, y=680, width=120, height=25)
 
     def _toggle_theme(self):
-        new_theme = "dark" if self.current_theme == "light" else "light"
-        self._change_theme(new_theme)
-        self.theme_btn.config(text=f"Theme: {new_theme.title()}")
+        self._change_theme("dark" if self.current_theme == "light" else "light")
 
     def _on_button_click(self, char):
         funcs = {'sin', 'cos', 'tan', 'log', 'log10', 'sqrt', 'deg(x)', 'rad(x)'}
         specials = {'clr', '←', '='}
-        constants = {'pi': str(pi), 'e': str(e), 'tau': str(tau)}
+        constants = {'pi', 'e', 'tau'}
+        if not char:
+            return
+
+        # Any new input supersedes a calculation that is still running
+        if self.evaluator.busy:
+            self.evaluator.cancel()
+            self._set_busy(False)
 
         if char == 'clr':
-            self.expression = ''
+            self.tokens.reset()
             self.just_evaluated = False
         elif char == '←':
             if self.just_evaluated:
-                self.expression = ''
+                self.tokens.reset()
                 self.just_evaluated = False
             else:
-                self.expression = self.expression[:-1]
+                self.tokens.pop()
         elif char == '=':
             self._evaluate()
             return
-        elif char in constants:
+        elif char in constants or char == 'x':
+            # Insert the name; the engine folds constants once per expression, x is the plot variable
             if self.just_evaluated:
-                self.expression = constants[char]
+                self.tokens.reset(char)
             else:
-                self.expression += constants[char]
+                self.tokens.append(char, close=True)
             self.just_evaluated = False
         elif char == '^':
-            self.expression += '**'
+            self.tokens.append('**')
             self.just_evaluated = False
         elif char in funcs:
             if char == 'deg(x)':
-                self.expression += 'degrees('
+                self.tokens.append('degrees(')
             elif char == 'rad(x)':
-                self.expression += 'radians('
+                self.tokens.append('radians(')
             else:
-                self.expression += f"{char}("
+                self.tokens.append(f"{char}(")
             self.just_evaluated = False
         else:
             if self.just_evaluated and (char.isdigit() or char == '.'):
-                self.expression = char
+                self.tokens.reset(char)
             else:
-                self.expression += char
+                self.tokens.append(char)
             self.just_evaluated = False
 
+        self.expression = self.tokens.text
         self._update_entry()
+        self.open_preview().schedule(self.tokens.snapshot())
+        self._update_plot()
 
     def _update_entry(self):
-        self.entry.delete(0, tk.END)
-        self.entry.insert(0, self.expression)
+        self.display.update(self.expression)
 
     def _evaluate(self):
-        try:
-            allowed_names = {k: v for k, v in globals().items() if k in
-                             ['sin', 'cos', 'tan', 'sqrt', 'log', 'log10', 'radians', 'degrees', 'pi', 'e', 'tau']}
-            expr = insert_implicit_multiplication(self.expression)
-            self.expression = str(eval(expr, {"__builtins__": {}}, allowed_names))
-        except Exception:
-            self.expression = "Error"
+        if self.preview is not None:
+            self.preview.clear()
+        from calc_tokens import source
+        self._set_busy(True)
+        tokens = self.tokens.snapshot()
+        self.evaluator.submit(tokens,
+                              lambda result, error, expr=source(tokens): self._show_result(expr, result, error))
+
+    def _show_result(self, expression, result, error):
+        self._set_busy(False)
+        self.open_history().append(expression, "Error" if error else result)
+        if self.history_panel is not None and self.history_panel.winfo_exists():
+            self.history_panel.refresh()
+        self._set_text("Error" if error else result)
         self.just_evaluated = True
         self._update_entry()
 
+    def _set_busy(self, busy):
+        theme = self.themes[self.current_theme]
+        self.config(cursor="watch" if busy else "")
+        self.entry.config(fg=theme["shadow_dark"] if busy else theme["fg"])
+
     def _bind_keys(self):
         self.bind("<Key>", self._handle_key)
 
@@ -302,9 +548,12 @@ class Calculator(tk.Tk):
             self._evaluate()
         elif event.keysym == "BackSpace":
             self._on_button_click("←")
-        elif event.char in "0123456789.+-*/()%^":
+        elif not event.char:
+            # Shift, Ctrl, Alt and other keys without text must not cancel a running '='
+            return
+        elif event.char in "0123456789.+-*/()%^x":
             self._on_button_click(event.char)
 
 
 if __name__ == "__main__":
-    Calculator().mainloop()
\ No newline at end of file
+    Calculator(single_canvas="--single-canvas" in sys.argv).mainloop()
\ No newline at end of file
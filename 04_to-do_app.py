@@ -1,91 +1,146 @@
 import ttkbootstrap as tb
 from ttkbootstrap.constants import *
 import tkinter as tk
-from tkinter import simpledialog, messagebox
 from datetime import datetime, timedelta
-import json
-import os
+import sys
+from todo_storage import JsonBackend
+from todo_writer import BackgroundWriter
+from todo_list import VirtualTaskList
 
 class Task:
-    def __init__(self, text, done=False, due_date=None):
+    def __init__(self, text, done=False, due_date=None, id=None):
         self.text = text
         self.done = done
         self.due_date = due_date
+        self.id = id
 
     def to_dict(self):
-        return {"text": self.text, "done": self.done, "due_date": self.due_date}
+        return {"id": self.id, "text": self.text, "done": self.done, "due_date": self.due_date}
 
     @staticmethod
     def from_dict(data):
-        return Task(data["text"], data["done"], data.get("due_date"))
+        return Task(data["text"], data["done"], data.get("due_date"), data.get("id"))
 
 class TaskManager:
-    def __init__(self, filepath="tasks.json"):
-        self.filepath = filepath
+    """The task list in its current sort order and filter, kept in a pluggable backend.
+
+    tasks is indexed by display position. A JsonBackend hands back a plain list;
+    an SqliteBackend a lazy view that loads only the rows that are looked at.
+    """
+
+    def __init__(self, filepath="tasks.json", journal=False, backend=None):
+        self.backend = JsonBackend(filepath, journal) if backend is None else backend
+        self.sort_method = "entry"
+        self.done_filter = None
         self.tasks = []
-        self.original_order = []
+
+    def _refresh(self):
+        self.tasks = self.backend.view(self.sort_method, self.done_filter, Task.from_dict)
+
+    def load(self):
+        self.backend.load()
+        self._refresh()
 
     def add_task(self, task):
-        self.tasks.append(task)
-        self.original_order.append(task)
+        task.id = self.backend.add(task.to_dict())
+        self._refresh()
+
+    def _moves(self, fields):
+        # Whether changing these fields can move a task within, into or out of the view
+        return (("done" in fields and self.done_filter is not None)
+                or ("text" in fields and self.sort_method in ("alphabet", "length"))
+                or ("due_date" in fields and self.sort_method == "due_date"))
+
+    def update_task(self, index, **fields):
+        """Change one task; returns True when the view had to be rebuilt around it."""
+        task = self.tasks[index]
+        self.backend.update(task.id, fields)
+        if self._moves(fields):
+            self._refresh()
+            return True
+        # Same place in the same view: update the shown task instead of rebuilding the list
+        for name, value in fields.items():
+            setattr(task, name, value)
+        return False
 
     def delete_tasks(self, indices):
-        for index in sorted(indices, reverse=True):
-            if 0 <= index < len(self.tasks):
-                # Also remove from original_order
-                task_to_remove = self.tasks[index]
-                self.tasks.pop(index)
-                if task_to_remove in self.original_order:
-                    self.original_order.remove(task_to_remove)
+        ids = [self.tasks[index].id for index in sorted(set(indices)) if 0 <= index < len(self.tasks)]
+        if ids:
+            self.backend.delete(ids)
+            self._refresh()
+
+    def delete_done(self):
+        """Delete the finished tasks in the current view; returns how many there were."""
+        if self.done_filter is False:
+            # Only open tasks are shown, so none of the finished ones were selected
+            return 0
+        deleted = self.backend.delete_done()
+        if deleted:
+            self._refresh()
+        return deleted
 
     def save(self):
-        with open(self.filepath, "w") as f:
-            json.dump([t.to_dict() for t in self.tasks], f, indent=2)
+        self.backend.save()
 
-    def load(self):
-        if os.path.exists(self.filepath):
-            with open(self.filepath) as f:
-                data = json.load(f)
-                self.tasks = [Task.from_dict(d) for d in data]
-                self.original_order = self.tasks.copy()
+    def close(self):
+        self.backend.close()
 
     def sort_tasks(self, method="entry"):
-        if method == "alphabet":
-            self.tasks.sort(key=lambda t: t.text.lower())
-        elif method == "length":
-            self.tasks.sort(key=lambda t: len(t.text))
-        elif method == "due_date":
-            self.tasks.sort(key=lambda t: (t.due_date or "9999-12-31"))
-        elif method == "entry":
-            # Restore original order for existing tasks only
-            filtered_order = [t for t in self.original_order if t in self.tasks]
-            self.tasks = filtered_order.copy()
+        # "entry", "alphabet", "length" or "due_date"; entry order is the order tasks were added
+        self.sort_method = method
+        self._refresh()
+
+    def filter_tasks(self, done=None):
+        # None shows every task, False only open ones, True only finished ones
+        self.done_filter = done
+        self._refresh()
+
+    def due_between(self, start, end):
+        """Open tasks due between two ISO dates, inclusive."""
+        return [Task.from_dict(row) for row in self.backend.due(start, end)]
 
 class ToDoApp(tb.Window):
-    def __init__(self):
+    def __init__(self, sqlite=False):
         super().__init__(themename="darkly")
         self.title("To-Do List App")
         self.geometry("500x600")
         self.minsize(350, 450)
 
-        self.task_manager = TaskManager()
+        backend = None
+        if sqlite:
+            from todo_storage import SqliteBackend
+            backend = SqliteBackend()
+        self.task_manager = TaskManager(journal=True, backend=backend)
         self.task_manager.load()
-        self.selected_vars = []
+        # Saves happen on a worker thread; bursts of changes are written once
+        self.writer = BackgroundWriter(self.task_manager.save)
 
         self._create_menu()
         self._create_widgets()
         self._render_tasks()
         self.after(1000 * 60, self._check_reminders)
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+
+    def _on_close(self):
+        # The writer reports through logging and must be done before the storage closes
+        self.writer.close()
+        self.task_manager.close()
+        self.destroy()
 
     def _create_menu(self):
         menubar = tk.Menu(self)
-        theme_menu = tk.Menu(menubar, tearoff=0)
-        theme_menu.add_command(label="Light Theme", command=lambda: self._change_theme("flatly"))
-        theme_menu.add_command(label="Dark Theme", command=lambda: self._change_theme("darkly"))
-        theme_menu.add_command(label="Solar Theme", command=lambda: self._change_theme("solar"))
-        menubar.add_cascade(label="Themes", menu=theme_menu)
+        # Items are added the first time the menu is opened, not at startup
+        self.theme_menu = tk.Menu(menubar, tearoff=0, postcommand=self._fill_theme_menu)
+        menubar.add_cascade(label="Themes", menu=self.theme_menu)
         self.config(menu=menubar)
 
+    def _fill_theme_menu(self):
+        if self.theme_menu.index(END) is not None:
+            return
+        self.theme_menu.add_command(label="Light Theme", command=lambda: self._change_theme("flatly"))
+        self.theme_menu.add_command(label="Dark Theme", command=lambda: self._change_theme("darkly"))
+        self.theme_menu.add_command(label="Solar Theme", command=lambda: self._change_theme("solar"))
+
     def _change_theme(self, name):
         self.style.theme_use(name)
 
@@ -103,19 +158,9 @@ class ToDoApp(tb.Window):
         self.add_btn = tb.Button(entry_frame, text="Add Task", command=self._add_task)
         self.add_btn.pack(side=LEFT, padx=(10, 0))
 
-        self.task_list_container = tb.Frame(self.main_frame)
-        self.task_list_container.pack(fill=BOTH, expand=YES)
-
-        self.canvas = tb.Canvas(self.task_list_container, highlightthickness=0)
-        self.canvas.pack(side=LEFT, fill=BOTH, expand=YES)
-
-        self.scrollbar = tb.Scrollbar(self.task_list_container, orient=VERTICAL, command=self.canvas.yview)
-        self.scrollbar.pack(side=RIGHT, fill=Y)
-
-        self.canvas.configure(yscrollcommand=self.scrollbar.set)
-        self.task_list_frame = tb.Frame(self.canvas)
-        self.canvas.create_window((0, 0), window=self.task_list_frame, anchor="nw")
-        self.task_list_frame.bind("<Configure>", lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all")))
+        # Only the rows in view have widgets; they are rebound as the list scrolls
+        self.task_list = VirtualTaskList(self.main_frame, on_toggle=self._toggle_done, on_edit=self._edit_task)
+        self.task_list.pack(fill=BOTH, expand=YES)
 
         control_frame = tb.Frame(self.main_frame)
         control_frame.pack(fill=X, pady=(10, 0))
@@ -144,6 +189,14 @@ class ToDoApp(tb.Window):
 
         self.sort_dropdown.pack(side=LEFT, padx=(0,10))
 
+        # Filter dropdown
+        self.filter_var = tk.StringVar(value="All")
+        filters = {"All": None, "Open": False, "Done": True}
+        self.filter_dropdown = tb.OptionMenu(control_frame, self.filter_var, "All", *filters,
+                                            command=lambda label: self._on_filter_change(filters[label]),
+                                            style="info")
+        self.filter_dropdown.pack(side=LEFT, padx=(0,10))
+
         self.delete_btn = tb.Button(control_frame, text="Delete Selected", bootstyle="danger", command=self._delete_selected)
         self.delete_btn.pack(side=LEFT, expand=YES, fill=X, padx=5)
 
@@ -153,6 +206,7 @@ class ToDoApp(tb.Window):
         def on_submit():
             text = text_entry.get().strip()
             if not text:
+                from tkinter import messagebox
                 messagebox.showerror("Error", "Task cannot be empty.")
                 return
 
@@ -161,7 +215,7 @@ class ToDoApp(tb.Window):
             popup.destroy()
 
             self.task_manager.add_task(Task(text, due_date=due_date))
-            self.task_manager.save()
+            self.writer.request()
             self._render_tasks()
             self.entry.delete(0, END)  # Clear main entry
 
@@ -187,70 +241,61 @@ class ToDoApp(tb.Window):
         tb.Button(frame, text="Add", bootstyle="success", command=on_submit).pack(pady=5)
 
     def _render_tasks(self):
-        for widget in self.task_list_frame.winfo_children():
-            widget.destroy()
-        self.selected_vars.clear()
-
-        for idx, task in enumerate(self.task_manager.tasks):
-            var = tb.BooleanVar(value=task.done)
-            task_text = task.text
-            if task.due_date:
-                task_text += f" (Due: {task.due_date})"
-
-            cb = tb.Checkbutton(
-                self.task_list_frame,
-                text=task_text,
-                bootstyle="success-round-toggle" if task.done else "secondary-round-toggle",
-                variable=var,
-                command=lambda i=idx, v=var: self._toggle_done(i, v.get())
-            )
-            cb.pack(anchor="w", pady=2, padx=5)
-            cb.bind("<Double-1>", lambda e, i=idx: self._edit_task(i))
-            self.selected_vars.append(var)
+        self.task_list.set_tasks(self.task_manager.tasks)
 
     def _toggle_done(self, index, done):
-        self.task_manager.tasks[index].done = done
-        self.task_manager.save()
-        self._render_tasks()
+        self._update_task(index, done=done)
+        self.writer.request()
+
+    def _update_task(self, index, **fields):
+        if self.task_manager.update_task(index, **fields):
+            self._render_tasks()
+        else:
+            self.task_list.update_task(self.task_manager.tasks[index])
 
     def _delete_selected(self):
-        indices_to_delete = [i for i, var in enumerate(self.selected_vars) if var.get()]
-        if not indices_to_delete:
+        # The checked rows are the finished tasks in the current filter, including
+        # those scrolled out of view
+        if not self.task_manager.delete_done():
             return
-        self.task_manager.delete_tasks(indices_to_delete)
-        self.task_manager.save()
+        self.writer.request()
         self._render_tasks()
 
     def _on_sort_change(self, selection):
         self.task_manager.sort_tasks(selection)
         self._render_tasks()
 
+    def _on_filter_change(self, done):
+        self.task_manager.filter_tasks(done)
+        self._render_tasks()
+
     def _edit_task(self, index):
+        from tkinter import simpledialog
         task = self.task_manager.tasks[index]
         new_text = simpledialog.askstring("Edit Task", "Update task text:", initialvalue=task.text)
         if new_text:
-            task.text = new_text
-            self.task_manager.save()
-            self._render_tasks()
+            self._update_task(index, text=new_text)
+            self.writer.request()
 
     def _check_reminders(self):
         today = datetime.today().date()
         due_soon = []
 
-        for task in self.task_manager.tasks:
-            if task.due_date and not task.done:
-                try:
-                    due_date = datetime.strptime(task.due_date, "%Y-%m-%d").date()
-                    if today <= due_date <= today + timedelta(days=1):
-                        due_soon.append(task.text + f" (Due: {task.due_date})")
-                except Exception:
-                    continue
+        # The backend narrows it down to open tasks in the date range; only those get parsed
+        for task in self.task_manager.due_between(today.isoformat(), (today + timedelta(days=1)).isoformat()):
+            try:
+                due_date = datetime.strptime(task.due_date, "%Y-%m-%d").date()
+                if today <= due_date <= today + timedelta(days=1):
+                    due_soon.append(task.text + f" (Due: {task.due_date})")
+            except Exception:
+                continue
 
         if due_soon:
+            from tkinter import messagebox
             messagebox.showinfo("Reminder", "Tasks due soon:\n" + "\n".join(due_soon))
 
         self.after(1000 * 60 * 60, self._check_reminders)
 
 if __name__ == "__main__":
-    app = ToDoApp()
+    app = ToDoApp(sqlite="--sqlite" in sys.argv)
     app.mainloop()
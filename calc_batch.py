@@ -0,0 +1,70 @@
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from calc_engine import evaluate
+
+
+def evaluate_line(line):
+    expression = line.strip()
+    if not expression:
+        # Keep output lines aligned with input lines
+        return ""
+    try:
+        return f"= {evaluate(expression)}"
+    except Exception as e:
+        return f"= Error: {str(e)}"
+
+
+def evaluate_chunk(lines):
+    return "".join(evaluate_line(line) + "\n" for line in lines)
+
+
+def read_chunks(lines, chunk_size):
+    lines = iter(lines)
+    while True:
+        chunk = list(islice(lines, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run_batch(infile, outfile, workers=None, chunk_size=2000):
+    workers = workers or os.cpu_count() or 1
+    chunks = read_chunks(infile, chunk_size)
+    if workers == 1:
+        for chunk in chunks:
+            outfile.write(evaluate_chunk(chunk))
+        return
+
+    # Only a few chunks per worker are ever in flight, so memory stays bounded
+    # however long the input is, and results are written back in input order.
+    max_pending = workers * 2
+    pending = deque()
+    with ProcessPoolExecutor(workers) as pool:
+        for chunk in chunks:
+            pending.append(pool.submit(evaluate_chunk, chunk))
+            if len(pending) >= max_pending:
+                outfile.write(pending.popleft().result())
+        while pending:
+            outfile.write(pending.popleft().result())
+
+
+def main(argv):
+    workers = None
+    if argv[:1] == ["-j"] and len(argv) >= 2:
+        workers = int(argv[1])
+        argv = argv[2:]
+    if not argv or argv[0] == "-":
+        run_batch(sys.stdin, sys.stdout, workers)
+    else:
+        with open(argv[0]) as f:
+            run_batch(f, sys.stdout, workers)
+    sys.stdout.flush()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,269 @@
+import argparse
+import importlib.util
+import json
+import os
+import random
+import sys
+import time
+import timeit
+
+from calc_engine import MODES, ExpressionEngine
+from calc_tokens import TokenStream
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = "calc_bench_baseline.json"
+
+PRECISION_CORPUS = [
+    "1+2*3-4",
+    "factorial(20)//3+2**40",
+    "0.1+0.2",
+    "1/3+1/6-1/7",
+    "sqrt(2)*sin(pi/4)",
+    "(1.5*2.25-0.75)/3",
+]
+
+
+def load_script(filename, name):
+    # The apps are numbered scripts, so they cannot be imported by name
+    spec = importlib.util.spec_from_file_location(name, os.path.join(HERE, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def build_corpora(seed=1234):
+    rng = random.Random(seed)
+    funcs = ["sin", "cos", "tan", "sqrt", "log", "log10"]
+
+    def number():
+        return str(rng.randint(1, 99)) if rng.random() < 0.6 else f"{rng.uniform(0, 10):.3f}"
+
+    def term():
+        if rng.random() < 0.4:
+            return f"{rng.choice(funcs)}({number()})"
+        return f"{number()}{rng.choice('*/')}{number()}"
+
+    short = ["1+2", "sin(pi/2)", "sqrt(16)*3", "2**10", "log10(1000)-1", "tan(0.5)/cos(0.3)",
+             "(1+2)*(3+4)", "e**2-tau"]
+    short += [f"{term()}{rng.choice('+-')}{term()}" for _ in range(40)]
+
+    nested = []
+    for depth in (10, 25, 50, 90):
+        nested.append("sin(" * depth + "1" + ")" * depth)
+        nested.append("(" * depth + "1" + "".join(f"+{i})" for i in range(depth)))
+    nested += ["sqrt(" + "+".join(f"{rng.choice(funcs)}({number()})" for _ in range(8)) + ")" for _ in range(8)]
+
+    long_chain = ["+".join(term() for _ in range(n)) for n in (50, 100, 200, 400)]
+
+    errors = ["1/0", "sqrt(-1)", "foo(2)", "2+", "(1", "9**9**9", "factorial(10**6)",
+              "__import__('os')", "(1).__class__", "log(0)", "1" + "+" * 5]
+
+    return {"short": short, "nested": nested, "long_chain": long_chain, "errors": errors}
+
+
+class Stub:
+    # Stands in for Tk widgets and roots: every method exists and does nothing
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+class SyncEvaluator:
+    # BackgroundEvaluator without the thread, so callbacks run before timing stops
+    busy = False
+
+    def __init__(self, evaluate):
+        self.evaluate = evaluate
+
+    def submit(self, expression, callback):
+        try:
+            result = self.evaluate(expression)
+        except Exception as error:
+            callback(None, error)
+        else:
+            callback(result, None)
+
+    def cancel(self):
+        pass
+
+
+def make_cases():
+    console = load_script("03_calculator_console.py", "calc_console")
+    gui = load_script("03_calculator_gui.py", "calc_gui")
+    gui_v2 = load_script("03_calculator_gui_v2.py", "calc_gui_v2")
+
+    v1 = object.__new__(gui.ScientificCalculator)
+    v1.root, v1.entry, v1.display, v1.preview, v1.history = Stub(), Stub(), Stub(), Stub(), Stub()
+    v1.history_panel = None
+    v1.just_evaluated = False
+    v1.evaluator = SyncEvaluator(lambda expr: str(gui.evaluate(expr)))
+
+    def run_v1(expr):
+        v1.expression = expr
+        v1.evaluate_expression()
+        return v1.expression
+
+    # Tk methods used by _evaluate are shadowed on the instance, so no display is needed
+    v2 = object.__new__(gui_v2.Calculator)
+    v2.entry, v2.display, v2.preview, v2.history = Stub(), Stub(), Stub(), Stub()
+    v2.history_panel = None
+    v2.config = Stub().config
+    v2.themes = {"light": {"fg": "#333333", "shadow_dark": "#a3b1c6"}}
+    v2.current_theme = "light"
+    v2.just_evaluated = False
+    v2._tokens = TokenStream(gui_v2.functions)
+    v2.evaluator = SyncEvaluator(gui_v2.evaluate_display)
+
+    def run_v2(expr):
+        gui_v2.insert_implicit_multiplication(expr)
+        v2.tokens.reset(expr)
+        v2._evaluate()
+        return v2.expression
+
+    return {
+        "console.evaluate_expression": console.evaluate_expression,
+        "ScientificCalculator.evaluate_expression": run_v1,
+        "v2 insert_implicit_multiplication+_evaluate": run_v2,
+    }
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def measure(func, corpus, min_time=0.2):
+    latencies = []
+    start = time.perf_counter()
+    while time.perf_counter() - start < min_time or not latencies:
+        for expr in corpus:
+            t0 = time.perf_counter_ns()
+            func(expr)
+            latencies.append(time.perf_counter_ns() - t0)
+    latencies.sort()
+    total = sum(latencies) / 1e9
+    return {"ops_per_sec": len(latencies) / total,
+            "p50_us": percentile(latencies, 0.50) / 1e3,
+            "p99_us": percentile(latencies, 0.99) / 1e3}
+
+
+def run_suite(min_time=0.2):
+    corpora = build_corpora()
+    results = {}
+    for case, func in make_cases().items():
+        for corpus_name, corpus in corpora.items():
+            results[f"{case} [{corpus_name}]"] = measure(func, corpus, min_time)
+    return results
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for name, current in results.items():
+        old = baseline.get(name)
+        if old is None:
+            continue
+        if current["ops_per_sec"] < old["ops_per_sec"] * (1 - threshold):
+            regressions.append(f"{name}: ops/sec {old['ops_per_sec']:.0f} -> {current['ops_per_sec']:.0f}")
+        if current["p99_us"] > old["p99_us"] * (1 + threshold):
+            regressions.append(f"{name}: p99 {old['p99_us']:.1f}us -> {current['p99_us']:.1f}us")
+    return regressions
+
+
+def print_results(results, baseline=None):
+    print(f"{'benchmark':62}{'ops/sec':>12}{'p50':>10}{'p99':>10}{'vs base':>9}")
+    for name, r in results.items():
+        change = ""
+        if baseline and name in baseline:
+            change = f"{r['ops_per_sec'] / baseline[name]['ops_per_sec'] - 1:+.0%}"
+        print(f"{name:62}{r['ops_per_sec']:12.0f}{r['p50_us']:8.1f}us{r['p99_us']:8.1f}us{change:>9}")
+
+
+def bench_modes(corpus=PRECISION_CORPUS, number=2000):
+    """Per-expression cost of each precision mode, compiled code cached as in real use."""
+    results = {}
+    for mode in MODES:
+        engine = ExpressionEngine(mode=mode)
+        codes = [engine.compile(expr) for expr in corpus]
+        results[mode] = [min(timeit.repeat(lambda: engine.run(code), number=number, repeat=3)) / number
+                         for code in codes]
+    return results
+
+
+def print_modes(results, corpus=PRECISION_CORPUS):
+    print(f"{'expression':28}" + "".join(f"{mode:>12}" for mode in MODES))
+    for i, expr in enumerate(corpus):
+        base = results["float"][i]
+        cells = "".join(f"{results[mode][i] * 1e6:9.2f}us" if mode == "float"
+                        else f"{results[mode][i] / base:10.2f}x " for mode in MODES)
+        print(f"{expr:28}{cells}")
+
+
+def bench_theme(number=2000):
+    """Python-side cost of a v2 theme switch over a full keypad of stub buttons."""
+    gui_v2 = load_script("03_calculator_gui_v2.py", "calc_gui_v2")
+    v2 = object.__new__(gui_v2.Calculator)
+    v2.themes = {
+        "light": {"bg": "#e0e0e0", "fg": "#333333", "shadow_light": "#ffffff", "shadow_dark": "#a3b1c6"},
+        "dark": {"bg": "#2e2e2e", "fg": "#e0e0e0", "shadow_light": "#3a3a3a", "shadow_dark": "#1e1e1e"},
+    }
+    v2.current_theme = v2._applied_theme = "light"
+    v2._theme_after = None
+    v2.single_canvas = False
+    v2.configure = v2.after_idle = Stub().after_idle
+    v2.entry, v2.preview_label, v2.btn_frame, v2.theme_btn = Stub(), Stub(), Stub(), Stub()
+    v2.buttons = {label: Stub() for label in gui_v2.BUTTON_CATEGORIES}
+
+    def switch():
+        v2._toggle_theme()
+        v2._apply_theme()
+
+    def burst():
+        # Nine toggles before the idle pass runs still cost one recolor
+        for _ in range(9):
+            v2._toggle_theme()
+        v2._apply_theme()
+
+    return {"switch": min(timeit.repeat(switch, number=number, repeat=3)) / number,
+            "burst of 9 toggles": min(timeit.repeat(burst, number=number, repeat=3)) / number}
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Headless benchmarks for the calculator evaluation paths")
+    parser.add_argument("--modes", action="store_true", help="compare precision modes instead")
+    parser.add_argument("--theme", action="store_true", help="time a v2 theme switch instead")
+    parser.add_argument("--save", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown before flagging")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per benchmark")
+    args = parser.parse_args(argv)
+
+    if args.modes:
+        print_modes(bench_modes())
+        return 0
+    if args.theme:
+        for name, seconds in bench_theme().items():
+            print(f"{name:24}{seconds * 1e6:9.1f}us")
+        return 0
+
+    results = run_suite(args.min_time)
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+
+    if args.save:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+    if baseline:
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print("\nRegressions:")
+            for line in regressions:
+                print(" " + line)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,53 @@
+import tkinter as tk
+
+ELLIPSIS = "…"
+
+
+class EntryDisplay:
+    """Keeps an Entry showing an expression with tail-only edits.
+
+    Only the part that differs from what is on screen is deleted and
+    re-inserted, so typing at the end costs one small insert. Expressions
+    longer than 2 * window are shown from a moving window near the end,
+    prefixed with an ellipsis, which keeps the Entry's own text (and every
+    Tk call on it) bounded however long the expression grows.
+    """
+
+    def __init__(self, entry, window=256):
+        self.entry = entry
+        self.window = window
+        self.offset = 0
+
+    def _target(self, expression):
+        length = len(expression)
+        if self.offset == 0 and length <= 2 * self.window:
+            return expression
+        if not (0 < length - self.offset <= 2 * self.window):
+            # Re-window only when the view overflows, so the cost is amortized
+            self.offset = max(0, length - self.window)
+        return (ELLIPSIS if self.offset else "") + expression[self.offset:]
+
+    def update(self, expression):
+        target = self._target(expression)
+        # The Entry never holds more than about 2 * window characters, so reading it is cheap
+        current = self.entry.get()
+        if target.startswith(current):
+            prefix = len(current)
+        elif current.startswith(target):
+            prefix = len(target)
+        else:
+            prefix = 0
+            for a, b in zip(current, target):
+                if a != b:
+                    break
+                prefix += 1
+        if prefix < len(current):
+            self.entry.delete(prefix, tk.END)
+        if prefix < len(target):
+            self.entry.insert(tk.END, target[prefix:])
+        self.entry.icursor(tk.END)
+        self.entry.xview_moveto(1)
+
+    def reset(self, expression=""):
+        self.offset = 0
+        self.update(expression)
@@ -0,0 +1,117 @@
+import mmap
+import os
+from array import array
+
+# Each entry is one "expression\tresult\n" line in the log. The index file holds
+# the byte offset of every line as a little-endian uint64, so entry n can be
+# found with one seek and the log itself never has to be loaded.
+OFFSET_SIZE = 8
+
+
+def _clean(text):
+    try:
+        text = str(text)
+    except ValueError:
+        # Ints past the int-to-str digit limit are logged rounded instead
+        from decimal import Decimal
+        text = format(Decimal(text), ".15e")
+    return text.replace("\t", " ").replace("\n", " ")
+
+
+class History:
+    def __init__(self, path="calc_history.log"):
+        self.path = path
+        self.index_path = path + ".idx"
+        self._log = open(self.path, "a+b")
+        self._index = open(self.index_path, "a+b")
+        self._repair_index()
+
+    def _repair_index(self):
+        # A crash between the two writes leaves log lines without offsets; index them now
+        count = os.path.getsize(self.index_path) // OFFSET_SIZE
+        self._index.truncate(count * OFFSET_SIZE)
+        start = self._offset(count - 1) if count else 0
+        log_size = os.path.getsize(self.path)
+        if count and start < log_size:
+            self._log.seek(start)
+            start += len(self._log.readline())
+        offsets = array("Q")
+        self._log.seek(start)
+        for line in iter(self._log.readline, b""):
+            if not line.endswith(b"\n"):
+                # Torn final write: drop it so new entries start on a line of their own
+                self._log.truncate(start)
+                break
+            offsets.append(start)
+            start += len(line)
+        if offsets:
+            self._index.write(offsets.tobytes())
+            self._index.flush()
+
+    def _offset(self, n):
+        self._index.seek(n * OFFSET_SIZE)
+        return int.from_bytes(self._index.read(OFFSET_SIZE), "little")
+
+    def __len__(self):
+        return os.path.getsize(self.index_path) // OFFSET_SIZE
+
+    def append(self, expression, result):
+        self._log.seek(0, os.SEEK_END)
+        offset = self._log.tell()
+        self._log.write(f"{_clean(expression)}\t{_clean(result)}\n".encode("utf-8"))
+        self._log.flush()
+        self._index.write(offset.to_bytes(OFFSET_SIZE, "little"))
+        self._index.flush()
+        return len(self) - 1
+
+    def _read_at(self, offset):
+        self._log.seek(offset)
+        expression, _, result = self._log.readline().decode("utf-8").rstrip("\n").partition("\t")
+        return expression, result
+
+    def get(self, n):
+        if n < 0:
+            n += len(self)
+        if not 0 <= n < len(self):
+            raise IndexError(f"no history entry {n}")
+        return self._read_at(self._offset(n))
+
+    def recent(self, count=20):
+        total = len(self)
+        return [(n, *self.get(n)) for n in range(max(0, total - count), total)]
+
+    def _entry_number(self, offset):
+        # Binary search the index for the line that starts at or before offset
+        lo, hi = 0, len(self) - 1
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if self._offset(mid) <= offset:
+                lo = mid
+            else:
+                hi = mid - 1
+        return lo
+
+    def search(self, text, limit=50):
+        """Newest-first entries containing text, scanning the memory-mapped log."""
+        if not text or os.path.getsize(self.path) == 0:
+            return []
+        needle = _clean(text).encode("utf-8")
+        matches = []
+        with mmap.mmap(self._log.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            end = len(data)
+            while len(matches) < limit:
+                pos = data.rfind(needle, 0, end)
+                if pos < 0:
+                    break
+                start = data.rfind(b"\n", 0, pos) + 1
+                n = self._entry_number(start)
+                # A line that is not in the index (torn by an older version) is not an entry
+                if self._offset(n) == start:
+                    matches.append((n, *self.get(n)))
+                # Continue before this line so each entry is reported once
+                end = start
+        return matches
+
+    def close(self):
+        self._log.close()
+        self._index.close()
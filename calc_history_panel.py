@@ -0,0 +1,53 @@
+import tkinter as tk
+
+
+class HistoryPanel(tk.Toplevel):
+    """Searchable list of past calculations; double-click an entry to reuse it."""
+
+    def __init__(self, master, history, on_select, limit=200):
+        super().__init__(master)
+        self.title("History")
+        self.geometry("360x420")
+        self.history = history
+        self.on_select = on_select
+        self.limit = limit
+        self.entries = []
+        self._after_id = None
+
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add("write", lambda *args: self._schedule_refresh())
+        search = tk.Entry(self, textvariable=self.search_var)
+        search.pack(fill=tk.X, padx=8, pady=8)
+        search.focus()
+
+        list_frame = tk.Frame(self)
+        list_frame.pack(fill=tk.BOTH, expand=True, padx=8, pady=(0, 8))
+        self.listbox = tk.Listbox(list_frame, activestyle="none")
+        self.listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar = tk.Scrollbar(list_frame, command=self.listbox.yview)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.listbox.config(yscrollcommand=scrollbar.set)
+        self.listbox.bind("<Double-1>", self._on_double_click)
+
+        self.refresh()
+
+    def _schedule_refresh(self):
+        if self._after_id is not None:
+            self.after_cancel(self._after_id)
+        self._after_id = self.after(150, self.refresh)
+
+    def refresh(self):
+        self._after_id = None
+        text = self.search_var.get().strip()
+        if text:
+            self.entries = self.history.search(text, self.limit)
+        else:
+            self.entries = self.history.recent(self.limit)[::-1]
+        self.listbox.delete(0, tk.END)
+        for n, expression, result in self.entries:
+            self.listbox.insert(tk.END, f"#{n}  {expression} = {result}")
+
+    def _on_double_click(self, event):
+        selection = self.listbox.curselection()
+        if selection:
+            self.on_select(self.entries[selection[0]][1])
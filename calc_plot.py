@@ -0,0 +1,217 @@
+import math
+import tkinter as tk
+
+from calc_engine import ExpressionEngine, ExpressionError
+
+NAN = float("nan")
+
+
+class CurveSampler:
+    """Adaptive samples of y = f(x), cached by x so pans and zooms reuse them.
+
+    Samples start on a grid of power-of-two steps aligned to multiples of the
+    step, and are refined by halving, so every x ever evaluated is a dyadic
+    number: a pan lands on the same grid and a zoom shares half of it, and only
+    the newly exposed x values miss the cache.
+    """
+
+    def __init__(self, func, max_cache=200000):
+        self.func = func
+        self.max_cache = max_cache
+        self.cache = {}
+        self.evaluations = 0
+
+    def value(self, x):
+        y = self.cache.get(x)
+        if y is None:
+            self.evaluations += 1
+            try:
+                y = float(self.func(x))
+            except (ArithmeticError, ValueError, TypeError):
+                y = NAN
+            if math.isinf(y):
+                y = NAN
+            self.cache[x] = y
+        return y
+
+    def _trim(self, x0, x1):
+        if len(self.cache) > self.max_cache:
+            span = x1 - x0
+            self.cache = {x: y for x, y in self.cache.items() if x0 - span <= x <= x1 + span}
+
+    def sample(self, x0, x1, scale, grid_px=4, tolerance=0.5, max_depth=5):
+        """Points (x, y) covering [x0, x1]; NaN y marks a gap in the curve.
+
+        scale is pixels per unit. An interval is halved while its midpoint is
+        more than tolerance pixels off the chord, so flat stretches cost one
+        sample every grid_px pixels and curvature gets up to 2**max_depth more.
+        """
+        self._trim(x0, x1)
+        step = 2.0 ** math.floor(math.log2(grid_px / scale))
+        first, last = math.floor(x0 / step), math.ceil(x1 / step)
+        value = self.value
+        points = [(first * step, value(first * step))]
+        for k in range(first, last):
+            stack = [(k * step, (k + 1) * step, 0)]
+            while stack:
+                a, b, depth = stack.pop()
+                ya, yb = value(a), value(b)
+                m = (a + b) / 2
+                if depth < max_depth:
+                    ym = value(m)
+                    gaps = math.isnan(ya) + math.isnan(ym) + math.isnan(yb)
+                    if (gaps and gaps < 3) or (not gaps and abs(ym - (ya + yb) / 2) * scale > tolerance):
+                        stack.append((m, b, depth + 1))
+                        stack.append((a, m, depth + 1))
+                        continue
+                elif not (math.isnan(ya) or math.isnan(yb)) and abs(yb - ya) * scale > tolerance:
+                    # Still steep at full depth: a midpoint outside the chord is a pole, not a slope
+                    ym = value(m)
+                    if not min(ya, yb) <= ym <= max(ya, yb):
+                        points.append((m, NAN))
+                points.append((b, yb))
+        return points
+
+
+def reduce_points(points, to_pixel, height):
+    """Pixel-space polylines: per pixel column keep only first, min, max and last.
+
+    That is all a line one pixel wide can show, so a curve costs at most four
+    points per column however many samples it has. Gaps split the polylines.
+    """
+    lines, flat = [], []
+    column, group = None, []
+
+    def flush():
+        if group:
+            ys = [py for px, py in group]
+            for i in sorted({0, ys.index(min(ys)), ys.index(max(ys)), len(group) - 1}):
+                flat.extend(group[i])
+            group.clear()
+
+    for x, y in points:
+        if math.isnan(y):
+            flush()
+            column = None
+            if len(flat) >= 4:
+                lines.append(flat)
+            flat = []
+            continue
+        px, py = to_pixel(x, y)
+        # Tk coordinates must stay finite and small; anything far off screen draws the same
+        py = min(max(py, -height), 2 * height)
+        if int(px) != column:
+            flush()
+            column = int(px)
+        group.append((round(px, 1), round(py, 1)))
+    flush()
+    if len(flat) >= 4:
+        lines.append(flat)
+    return lines
+
+
+class PlotPanel(tk.Toplevel):
+    """Graph of the calculator expression as f(x). Drag to pan, scroll to zoom."""
+
+    def __init__(self, master, names, expression="", bg="#ffffff", fg="#333333", curve="#e76f51"):
+        super().__init__(master)
+        self.title("Plot")
+        self.geometry("420x360")
+        self.engine = ExpressionEngine(names, variables=("x",))
+        self.expression = None
+        self.sampler = None
+        self.scale = 20.0
+        self.center = (0.0, 0.0)
+        self._drag = None
+        self._after_id = None
+        self._curve_items = []
+
+        self.canvas = tk.Canvas(self, bg=bg, highlightthickness=0)
+        self.canvas.pack(fill=tk.BOTH, expand=True)
+        self.curve_color = curve
+        self._x_axis = self.canvas.create_line(0, 0, 0, 0, fill=fg)
+        self._y_axis = self.canvas.create_line(0, 0, 0, 0, fill=fg)
+        self._status = self.canvas.create_text(8, 8, anchor="nw", fill=fg, text="")
+
+        self.canvas.bind("<Configure>", lambda event: self.schedule_redraw())
+        self.canvas.bind("<ButtonPress-1>", self._on_press)
+        self.canvas.bind("<B1-Motion>", self._on_drag)
+        self.canvas.bind("<MouseWheel>", lambda event: self._zoom(event, 1.25 if event.delta > 0 else 0.8))
+        self.canvas.bind("<Button-4>", lambda event: self._zoom(event, 1.25))
+        self.canvas.bind("<Button-5>", lambda event: self._zoom(event, 0.8))
+
+        self.set_expression(expression)
+
+    def set_expression(self, expression):
+        if expression == self.expression:
+            return
+        self.expression = expression
+        self.sampler = None
+        try:
+            code = self.engine.compile(expression)
+        except ExpressionError as exc:
+            message = str(exc)
+        else:
+            run = self.engine.run
+            self.sampler = CurveSampler(lambda x: run(code, {"x": x}))
+            message = f"y = {expression}"
+        self.canvas.itemconfig(self._status, text=message if expression else "Type an expression in x")
+        self.schedule_redraw()
+
+    def schedule_redraw(self):
+        # Drag and wheel events arrive faster than frames; draw once per idle
+        if self._after_id is None:
+            self._after_id = self.after_idle(self.redraw)
+
+    def _view(self):
+        width, height = self.canvas.winfo_width(), self.canvas.winfo_height()
+        cx, cy = self.center
+        x0 = cx - width / 2 / self.scale
+        y1 = cy + height / 2 / self.scale
+        return width, height, x0, y1
+
+    def redraw(self):
+        self._after_id = None
+        width, height, x0, y1 = self._view()
+        scale = self.scale
+
+        def to_pixel(x, y):
+            return (x - x0) * scale, (y1 - y) * scale
+
+        ax, ay = to_pixel(0, 0)
+        ax, ay = min(max(ax, -1), width + 1), min(max(ay, -1), height + 1)
+        self.canvas.coords(self._x_axis, 0, ay, width, ay)
+        self.canvas.coords(self._y_axis, ax, 0, ax, height)
+
+        lines = []
+        if self.sampler is not None and width > 1:
+            points = self.sampler.sample(x0, x0 + width / scale, scale)
+            lines = reduce_points(points, to_pixel, height)
+        # Reuse the existing line items: one per continuous piece of the curve
+        while len(self._curve_items) < len(lines):
+            self._curve_items.append(self.canvas.create_line(0, 0, 0, 0, fill=self.curve_color, width=2))
+        for item, flat in zip(self._curve_items, lines):
+            self.canvas.coords(item, flat)
+        for item in self._curve_items[len(lines):]:
+            self.canvas.delete(item)
+        del self._curve_items[len(lines):]
+
+    def _on_press(self, event):
+        self._drag = (event.x, event.y)
+
+    def _on_drag(self, event):
+        dx, dy = event.x - self._drag[0], event.y - self._drag[1]
+        self._drag = (event.x, event.y)
+        cx, cy = self.center
+        self.center = (cx - dx / self.scale, cy + dy / self.scale)
+        self.schedule_redraw()
+
+    def _zoom(self, event, factor):
+        # Keep the point under the cursor fixed
+        width, height, x0, y1 = self._view()
+        x, y = x0 + event.x / self.scale, y1 - event.y / self.scale
+        scale = min(max(self.scale * factor, 1e-6), 1e9)
+        factor, self.scale = scale / self.scale, scale
+        cx, cy = self.center
+        self.center = (x + (cx - x) / factor, y + (cy - y) / factor)
+        self.schedule_redraw()
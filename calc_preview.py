@@ -0,0 +1,174 @@
+from collections import OrderedDict
+
+from calc_tokens import COMMA, LPAREN, NAME, NUMBER, OP, RPAREN, Token, cache_key, parse
+from calc_worker import BackgroundEvaluator
+
+_OPERAND_END = (NUMBER, NAME, RPAREN)
+
+
+class PreviewEvaluator:
+    """Evaluates a token snapshot, reusing work from the previous snapshot.
+
+    Every sum and product that reaches the end of the expression, at the top
+    level and inside each group still being typed, remembers the value of its
+    prefixes (everything before a binary operator it splits at) and how far
+    it has scanned. Appending to a long expression, even deep inside an open
+    group, only evaluates what follows the last unchanged split at each
+    level. Other factors (numbers, names, calls, powers) are memoized by
+    their tokens.
+    """
+
+    def __init__(self, engine, cache_size=4096):
+        self.engine = engine
+        self.cache_size = cache_size
+        self._terms = OrderedDict()
+        self._last = ()
+        # (level, start) -> ([(operator index, value before it)], scan state)
+        self._folds = {}
+        self._mode = None
+
+    def _term(self, tokens):
+        key = (self.engine.mode, self.engine.precision, cache_key(tokens))
+        if key in self._terms:
+            self._terms.move_to_end(key)
+            return self._terms[key]
+        depth = sum(1 if t.kind == LPAREN else -1 if t.kind == RPAREN else 0 for t in tokens)
+        if depth > 0:
+            close = tokens[-1].start + len(tokens[-1].text)
+            tokens += tuple(Token(RPAREN, ")", close, True) for _ in range(depth))
+        value = self.engine.run(self.engine.compile_tree(key[2], lambda: parse(tokens)))
+        self._terms[key] = value
+        if len(self._terms) > self.cache_size:
+            self._terms.popitem(last=False)
+        return value
+
+    def evaluate(self, tokens):
+        # Preview what the user is heading towards: ignore a dangling operator
+        # and close any groups still open
+        end = len(tokens)
+        while end and tokens[end - 1].kind in (OP, COMMA, LPAREN):
+            end -= 1
+        tokens = tuple(tokens[:end])
+
+        mode = (self.engine.mode, self.engine.precision)
+        if mode != self._mode:
+            self._mode, self._last, self._folds = mode, (), {}
+        self._same = _common_length(tokens, self._last)
+        self._last = tokens
+        # Only the folds this snapshot touches are kept for the next one
+        self._previous, self._folds = self._folds, {}
+        if not tokens:
+            return self._term(tokens)
+        return self._sum(tokens, 0, len(tokens), True)
+
+    def _sum(self, tokens, start, end, last):
+        return self._fold(tokens, start, end, last, 0, ("+", "-"), self._product)
+
+    def _product(self, tokens, start, end, last, close=None):
+        return self._fold(tokens, start, end, last, 1, ("*", "/", "//", "%"), self._factor)
+
+    def _fold(self, tokens, start, end, last, level, ops, part):
+        # A split or scan is still valid if none of the tokens before it changed
+        splits, scan = self._previous.get((level, start), ([], None))
+        while splits and splits[-1][0] >= self._same:
+            splits.pop()
+        value, op, begin = None, None, start
+        if splits:
+            index, value = splits[-1]
+            op, begin = tokens[index].text, index + 1
+
+        # Resume the last part's scan where the previous snapshot left it
+        i, depth, close = begin, 0, None
+        if scan is not None and scan[0] == begin and scan[1] <= self._same:
+            i, depth, close = scan[1:]
+        while i < end:
+            if last and i == end - 1:
+                # Saved before the last token, which is the one that usually changes
+                scan = (begin, i, depth, close)
+            token = tokens[i]
+            if token.kind == LPAREN:
+                depth += 1
+            elif token.kind == RPAREN:
+                depth -= 1
+                if depth == 0 and close is None:
+                    close = i
+            elif (depth == 0 and token.kind == OP and token.text in ops
+                  and i > begin and tokens[i - 1].kind in _OPERAND_END):
+                value = self._combine(value, op, part(tokens, begin, i, False, close))
+                splits.append((i, value))
+                op, begin, close = token.text, i + 1, None
+            i += 1
+        if last:
+            self._folds[(level, start)] = (splits, scan)
+        return self._combine(value, op, part(tokens, begin, end, last, close))
+
+    def _factor(self, tokens, start, end, last, close):
+        # A signed group, finished or still open, is evaluated through its own
+        # splits; close is where the factor's first group ended, if it did
+        i = start
+        while i < end and tokens[i].kind == OP and tokens[i].text in ("+", "-"):
+            i += 1
+        if i < end and tokens[i].kind == LPAREN and (close is None or close == end - 1):
+            value = self._sum(tokens, i + 1, end if close is None else close, last)
+            if sum(sign.text == "-" for sign in tokens[start:i]) % 2:
+                with self.engine.number_context():
+                    value = -value
+            return value
+        return self._term(tokens[start:end])
+
+    def _combine(self, value, op, term):
+        if op is None:
+            return term
+        return self.engine.apply(op, value, term)
+
+
+def _common_length(a, b):
+    n = min(len(a), len(b))
+    if a[:n] == b[:n]:
+        return n
+    for i in range(n):
+        if a[i] != b[i]:
+            return i
+
+
+class LivePreview:
+    """Debounced preview of the current expression, computed off the Tk thread.
+
+    schedule() takes a token snapshot, or raw text when a `tokenize` function
+    is given (it then runs on the worker as well).
+    """
+
+    def __init__(self, widget, label, engine, delay_ms=150, tokenize=None):
+        self.widget = widget
+        self.label = label
+        self.delay_ms = delay_ms
+        self.tokenize = tokenize
+        self.evaluator = PreviewEvaluator(engine)
+        self._background = BackgroundEvaluator(widget, self._evaluate)
+        self._after_id = None
+
+    def _evaluate(self, expression):
+        tokens = self.tokenize(expression) if self.tokenize else expression
+        return str(self.evaluator.evaluate(tokens))
+
+    def schedule(self, expression):
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+        self._after_id = self.widget.after(self.delay_ms, self._start, expression)
+
+    def clear(self):
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+        self._background.cancel()
+        self.label.config(text="")
+
+    def _start(self, expression):
+        self._after_id = None
+        if not expression:
+            self.clear()
+            return
+        self._background.submit(expression, self._show)
+
+    def _show(self, result, error):
+        self.label.config(text="" if error else f"= {result}")
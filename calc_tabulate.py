@@ -0,0 +1,97 @@
+import math
+import sys
+
+import numpy as np
+
+from calc_engine import MATH_NAMES, ExpressionEngine, ExpressionError
+
+# math name -> vectorized NumPy equivalent
+UFUNCS = {
+    "sin": np.sin, "cos": np.cos, "tan": np.tan,
+    "asin": np.arcsin, "acos": np.arccos, "atan": np.arctan, "atan2": np.arctan2,
+    "sinh": np.sinh, "cosh": np.cosh, "tanh": np.tanh,
+    "asinh": np.arcsinh, "acosh": np.arccosh, "atanh": np.arctanh,
+    "exp": np.exp, "exp2": np.exp2, "expm1": np.expm1,
+    "log10": np.log10, "log2": np.log2, "log1p": np.log1p,
+    "sqrt": np.sqrt, "cbrt": np.cbrt, "pow": np.power, "hypot": np.hypot,
+    "fabs": np.fabs, "abs": np.absolute, "floor": np.floor, "ceil": np.ceil, "trunc": np.trunc,
+    "degrees": np.degrees, "radians": np.radians,
+    "copysign": np.copysign, "fmod": np.fmod, "ldexp": np.ldexp,
+    "isfinite": np.isfinite, "isinf": np.isinf, "isnan": np.isnan,
+    "round": np.round,
+}
+
+
+def _log(x, base=None):
+    if base is None:
+        return np.log(x)
+    return np.log(x) / np.log(base)
+
+
+def _per_element(func):
+    # linspace only yields floats; integer-only functions (factorial, gcd, comb, ...)
+    # get whole numbers as ints, and points outside a function's domain become nan
+    def call(*args):
+        args = [int(arg) if isinstance(arg, float) and arg.is_integer() else arg for arg in args]
+        try:
+            return float(func(*args))
+        except (ValueError, TypeError, ArithmeticError):
+            return math.nan
+    return np.vectorize(call, otypes=[float])
+
+
+def _build_names():
+    names = {}
+    for name, value in MATH_NAMES.items():
+        if name in UFUNCS:
+            names[name] = UFUNCS[name]
+        elif callable(value):
+            # No ufunc counterpart (gamma, factorial, ...): still works, just per element
+            names[name] = _per_element(value)
+        else:
+            names[name] = value
+    names["log"] = _log
+    return names
+
+
+NUMPY_NAMES = _build_names()
+# Array inputs are bounded by their length, so no wall-clock budget here
+engine = ExpressionEngine(NUMPY_NAMES, variables=("x",), time_budget=None)
+
+
+def parse_range(start, stop, count):
+    return np.linspace(float(start), float(stop), int(count))
+
+
+def tabulate(expression, xs, chunk_size=1 << 16):
+    """Evaluate an expression in x over xs, yielding (x, y) array chunks."""
+    code = engine.compile(expression)
+    xs = np.asarray(xs, dtype=float)
+    with np.errstate(all="ignore"):
+        for start in range(0, len(xs), chunk_size):
+            chunk = xs[start:start + chunk_size]
+            ys = engine.run(code, {"x": chunk})
+            yield chunk, np.broadcast_to(ys, chunk.shape)
+
+
+def write_table(expression, xs, out=sys.stdout, chunk_size=1 << 16):
+    for chunk, ys in tabulate(expression, xs, chunk_size):
+        np.savetxt(out, np.column_stack((chunk, ys)), fmt="%.12g", delimiter="\t")
+
+
+def main(argv):
+    if len(argv) != 4:
+        print("Usage: python calc_tabulate.py EXPRESSION START STOP COUNT")
+        print(' e.g.  python calc_tabulate.py "sin(x)*exp(-x)" 0 10 1000000')
+        return 2
+    expression, start, stop, count = argv
+    try:
+        write_table(expression, parse_range(start, stop, count))
+    except (ExpressionError, TypeError, ValueError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
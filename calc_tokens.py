@@ -0,0 +1,264 @@
+import ast
+import re
+from collections import namedtuple
+
+from calc_engine import ExpressionError
+
+NUMBER, NAME, OP, LPAREN, RPAREN, COMMA = "number", "name", "op", "(", ")", ","
+
+# text is what gets evaluated, start is the offset of the token in the typed text;
+# a closed token was ended by append(close=True) and never joins what follows
+Token = namedtuple("Token", "kind text start implicit closed", defaults=(False,))
+
+_TOKEN_RE = re.compile(r"""
+    \s*(?:
+      (?P<number>[\d.]+(?:[eE][+-]?\d+)?)
+    | (?P<name>[A-Za-z_]\w*)
+    | (?P<op>\*\*|//|[-+*/%^])
+    | (?P<punct>[(),])
+    | (?P<bad>\S)
+    )""", re.VERBOSE)
+
+_BINARY_OPS = {"+": ast.Add, "-": ast.Sub, "*": ast.Mult, "/": ast.Div,
+               "//": ast.FloorDiv, "%": ast.Mod, "**": ast.Pow}
+
+
+def _char_kind(ch):
+    if ch.isdigit() or ch == ".":
+        return NUMBER
+    if ch.isalpha() or ch == "_":
+        return NAME
+    if ch in "(),":
+        return ch
+    return OP
+
+
+class TokenStream:
+    """Token list kept in step with the typed text, one appended chunk at a time.
+
+    Implicit multiplication is inserted as tokens arrive (2pi, 2(, )(, )2,
+    )sin(), so nothing has to rescan the whole expression on '='. A name
+    followed by '(' is a call only if it is one of `functions`; pass None to
+    treat every name that way. With implicit=False adjacent operands are left
+    as they are, matching plain Python syntax.
+    """
+
+    def __init__(self, functions=None, text="", implicit=True):
+        self.functions = functions
+        self.implicit = implicit
+        self.reset(text)
+
+    def reset(self, text=""):
+        self.tokens = []
+        self.text = ""
+        self._joinable = False
+        for match in _TOKEN_RE.finditer(text):
+            kind = match.lastgroup
+            value, start = match.group(kind), match.start(kind)
+            if kind == "punct":
+                kind = value
+            elif kind == "bad":
+                kind = OP
+            self._push(kind, value, start)
+        self.text = text
+        self._joinable = bool(self.tokens) and not text[-1:].isspace()
+
+    def _is_call(self, name):
+        return self.functions is None or name in self.functions
+
+    def _push(self, kind, text, start):
+        prev = self.tokens[-1] if self.tokens else None
+        if self.implicit and prev is not None and kind in (NUMBER, NAME, LPAREN):
+            if prev.kind in (NUMBER, RPAREN) or (
+                    prev.kind == NAME and not (kind == LPAREN and self._is_call(prev.text))):
+                self.tokens.append(Token(OP, "*", start, True))
+        self.tokens.append(Token(kind, "**" if text == "^" else text, start, False))
+
+    def _exponent_start(self):
+        # Index of the number that the trailing "e", "e+" or "e-" tokens turn into
+        # scientific notation once a digit follows, as reset() reads "1e+5"
+        i = len(self.tokens) - 1
+        end = len(self.text) - 1
+        sign = self.tokens[i] if i >= 0 else None
+        if sign is not None and sign.kind == OP and sign.text in ("+", "-") and sign.start == end - 1:
+            i -= 1
+            end -= 1
+        name = self.tokens[i] if i >= 0 else None
+        if name is None or name.kind != NAME or name.text not in ("e", "E") or name.closed or name.start != end - 1:
+            return None
+        i -= 1
+        if i >= 0 and self.tokens[i].implicit:
+            i -= 1
+        if i < 0:
+            return None
+        number = self.tokens[i]
+        if (number.kind != NUMBER or number.closed or "e" in number.text.lower()
+                or number.start + len(number.text) != name.start):
+            return None
+        return i
+
+    def append(self, text, close=False):
+        # close=True ends the last token, so a name inserted by a button does
+        # not swallow digits typed after it
+        for ch in text:
+            start = len(self.text)
+            self.text += ch
+            if ch.isspace():
+                self._joinable = False
+                continue
+            kind = _char_kind(ch)
+            last = self.tokens[-1] if self.tokens and self._joinable and not self.tokens[-1].closed else None
+            exponent = self._exponent_start() if last is not None and ch.isdigit() else None
+            if exponent is not None:
+                number = self.tokens[exponent]
+                self.tokens[exponent:] = [number._replace(text=self.text[number.start:])]
+            elif last is not None and (
+                    (last.kind == NUMBER and (ch.isdigit() or kind == NUMBER and "e" not in last.text.lower()))
+                    or (last.kind == NAME and (kind == NAME or ch.isdigit()))
+                    or (last.kind == OP and last.text + ch in ("**", "//"))):
+                self.tokens[-1] = last._replace(text=last.text + ch)
+            else:
+                self._push(kind, ch, start)
+            self._joinable = kind not in (LPAREN, RPAREN, COMMA)
+        if close and self.tokens:
+            self.tokens[-1] = self.tokens[-1]._replace(closed=True)
+            self._joinable = False
+
+    def truncate(self, length):
+        # Drop every token that starts after the cut, then rescan the one it lands in
+        text = self.text
+        while self.tokens and self.tokens[-1].start >= length:
+            self.tokens.pop()
+        last = self.tokens[-1] if self.tokens else None
+        if last is not None:
+            start = last.start
+            while self.tokens and self.tokens[-1].start == start:
+                self.tokens.pop()
+        else:
+            start = 0
+        self.text = text[:start]
+        self._joinable = False
+        rest = text[start:length]
+        # A token closed by a button stays closed as long as none of it was cut
+        self.append(rest, close=last is not None and last.closed and len(rest.rstrip()) >= len(last.text))
+
+    def pop(self):
+        self.truncate(len(self.text) - 1)
+
+    def snapshot(self):
+        return tuple(self.tokens)
+
+    def __str__(self):
+        return "".join(token.text for token in self.tokens)
+
+
+def tokenize(text, functions=None, implicit=True):
+    return TokenStream(functions, text, implicit).snapshot()
+
+
+def source(tokens):
+    return "".join(token.text for token in tokens)
+
+
+def cache_key(tokens):
+    # source() loses token boundaries ("4 2" -> "42", "* *" -> "**"), so compiles from
+    # tokens are cached under kinds and texts, a tuple that never equals a text key
+    return tuple((token.kind, token.text) for token in tokens)
+
+
+class _Parser:
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def next(self):
+        token = self.peek()
+        if token is None:
+            raise ExpressionError("unexpected end of expression")
+        self.pos += 1
+        return token
+
+    def expect(self, kind):
+        token = self.next()
+        if token.kind != kind:
+            raise ExpressionError(f"expected '{kind}' but found '{token.text}'")
+        return token
+
+    def at_op(self, *ops):
+        token = self.peek()
+        return token is not None and token.kind == OP and token.text in ops
+
+    def node(self, node, token):
+        node.lineno, node.col_offset = 1, token.start
+        node.end_lineno, node.end_col_offset = 1, token.start + len(token.text)
+        return node
+
+    def expression(self):
+        left = self.term()
+        while self.at_op("+", "-"):
+            op = self.next()
+            left = self.node(ast.BinOp(left, _BINARY_OPS[op.text](), self.term()), op)
+        return left
+
+    def term(self):
+        left = self.unary()
+        while self.at_op("*", "/", "//", "%"):
+            op = self.next()
+            left = self.node(ast.BinOp(left, _BINARY_OPS[op.text](), self.unary()), op)
+        return left
+
+    def unary(self):
+        if self.at_op("+", "-"):
+            op = self.next()
+            operator = ast.UAdd() if op.text == "+" else ast.USub()
+            return self.node(ast.UnaryOp(operator, self.unary()), op)
+        return self.power()
+
+    def power(self):
+        base = self.atom()
+        if self.at_op("**"):
+            op = self.next()
+            return self.node(ast.BinOp(base, ast.Pow(), self.unary()), op)
+        return base
+
+    def atom(self):
+        token = self.next()
+        if token.kind == NUMBER:
+            try:
+                value = float(token.text) if any(c in token.text for c in ".eE") else int(token.text)
+            except ValueError:
+                raise ExpressionError(f"invalid number '{token.text}'") from None
+            return self.node(ast.Constant(value), token)
+        if token.kind == NAME:
+            name = self.node(ast.Name(token.text, ast.Load()), token)
+            nxt = self.peek()
+            if nxt is None or nxt.kind != LPAREN:
+                return name
+            self.next()
+            args = []
+            if self.peek() is not None and self.peek().kind == RPAREN:
+                self.next()
+            else:
+                args.append(self.expression())
+                while self.peek() is not None and self.peek().kind == COMMA:
+                    self.next()
+                    args.append(self.expression())
+                self.expect(RPAREN)
+            return self.node(ast.Call(name, args, []), token)
+        if token.kind == LPAREN:
+            inner = self.expression()
+            self.expect(RPAREN)
+            return inner
+        raise ExpressionError(f"unexpected '{token.text}'")
+
+
+def parse(tokens):
+    """Build an ast.Expression straight from tokens, without going back to text."""
+    parser = _Parser(tokens)
+    body = parser.expression()
+    if parser.peek() is not None:
+        raise ExpressionError(f"unexpected '{parser.peek().text}'")
+    return ast.Expression(body)
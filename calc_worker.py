@@ -0,0 +1,56 @@
+class BackgroundEvaluator:
+    """Runs evaluations on a worker thread and hands results back on the Tk thread.
+
+    Only the newest job counts: submitting again or calling cancel() drops the
+    previous one. A job that has not started yet is cancelled outright; one that
+    is already running finishes on the worker (the engine's cost limits keep
+    that short) and its result is discarded.
+    """
+
+    def __init__(self, widget, evaluate, poll_ms=15):
+        self.widget = widget
+        self.evaluate = evaluate
+        self.poll_ms = poll_ms
+        # Created on the first submit: concurrent.futures is slow to import at startup
+        self._executor = None
+        self._future = None
+        self._callback = None
+        self._generation = 0
+
+    @property
+    def busy(self):
+        return self._future is not None
+
+    def submit(self, expression, callback):
+        self.cancel()
+        if self._executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            self._executor = ThreadPoolExecutor(max_workers=1)
+        self._future = self._executor.submit(self.evaluate, expression)
+        self._callback = callback
+        # Tk is not thread-safe, so poll from the mainloop instead of calling back from the worker
+        self.widget.after(self.poll_ms, self._poll, self._generation)
+
+    def cancel(self):
+        self._generation += 1
+        if self._future is not None:
+            self._future.cancel()
+        self._future = None
+        self._callback = None
+
+    def _poll(self, generation):
+        if generation != self._generation:
+            return
+        if not self._future.done():
+            self.widget.after(self.poll_ms, self._poll, generation)
+            return
+        future, callback = self._future, self._callback
+        self._future = None
+        self._callback = None
+        error = future.exception()
+        callback(None if error else future.result(), error)
+
+    def shutdown(self):
+        self.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
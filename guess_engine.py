@@ -0,0 +1,148 @@
+import random
+from abc import ABC, abstractmethod
+
+# Upper end of the secret-number range for each level, as in the GUI's set_difficulty
+DIFFICULTIES = {"Easy": 50, "Medium": 100, "Hard": 500}
+
+# Feedback for a guess: the guess was too low, right, or too high
+TOO_LOW, CORRECT, TOO_HIGH = -1, 0, 1
+
+
+class Game:
+    """One round of the guessing game without any input or output."""
+
+    __slots__ = ("range_max", "number", "attempts", "finished")
+
+    def __init__(self, range_max=100, number=None, rng=random):
+        self.range_max = range_max
+        self.number = rng.randint(1, range_max) if number is None else number
+        self.attempts = 0
+        self.finished = False
+
+    def guess(self, value):
+        if self.finished:
+            raise ValueError("the game is already over")
+        self.attempts += 1
+        if value < self.number:
+            return TOO_LOW
+        if value > self.number:
+            return TOO_HIGH
+        self.finished = True
+        return CORRECT
+
+
+# States of a Session
+PLAYING, ASKING, DONE = "playing", "asking", "done"
+
+
+class Session:
+    """The console game as a state machine: text in, lines of text out.
+
+    start() and handle() return the lines to show; prompt is what to ask for
+    next, or None once the player has quit. Nothing here blocks, so one thread
+    or event loop can run any number of sessions, and __slots__ keeps each one
+    to a couple of small objects.
+    """
+
+    __slots__ = ("range_max", "rng", "game", "state")
+
+    def __init__(self, range_max=100, rng=random):
+        self.range_max = range_max
+        self.rng = rng
+        self.game = None
+        self.state = DONE
+
+    @property
+    def prompt(self):
+        if self.state == PLAYING:
+            return "Enter your guess: "
+        if self.state == ASKING:
+            return "Do you want to play again? (y/n): "
+        return None
+
+    def start(self):
+        self.game = Game(self.range_max, rng=self.rng)
+        self.state = PLAYING
+        return ["🎲 Welcome to the Number Guessing Game!",
+                f"I'm thinking of a number between 1 and {self.range_max}."]
+
+    def handle(self, text):
+        if self.state == PLAYING:
+            try:
+                guess = int(text)
+            except ValueError:
+                return ["❌ Please enter a valid number."]
+            result = self.game.guess(guess)
+            if result == TOO_LOW:
+                return ["Too low. Try again."]
+            if result == TOO_HIGH:
+                return ["Too high. Try again."]
+            self.state = ASKING
+            return [f"🎉 Correct! The number was {self.game.number}.",
+                    f"You guessed it in {self.game.attempts} attempts."]
+        if self.state == ASKING:
+            if text.strip().lower() == "y":
+                return self.start()
+            self.state = DONE
+            return ["Thanks for playing! Goodbye."]
+        return []
+
+
+class Solver(ABC):
+    """Keeps the range the number can still be in; subclasses pick a guess from it."""
+
+    def __init__(self, range_max, rng=random):
+        self.low = 1
+        self.high = range_max
+        self.rng = rng
+
+    @abstractmethod
+    def next_guess(self):
+        """Return the next number to try, within low..high."""
+
+    def feedback(self, guess, result):
+        if result == TOO_LOW:
+            self.low = max(self.low, guess + 1)
+        elif result == TOO_HIGH:
+            self.high = min(self.high, guess - 1)
+
+
+class BinarySearchSolver(Solver):
+    # Optimal: never more than ceil(log2(range_max + 1)) attempts
+    def next_guess(self):
+        return (self.low + self.high) // 2
+
+
+class RandomSolver(Solver):
+    def next_guess(self):
+        return self.rng.randint(self.low, self.high)
+
+
+class NoisySolver(Solver):
+    """Aims for the middle but misjudges it, like a person halving in their head.
+
+    The guess is the midpoint plus Gaussian noise of `noise` times the width of
+    the remaining range, rounded and kept inside the range.
+    """
+
+    def __init__(self, range_max, rng=random, noise=0.2):
+        super().__init__(range_max, rng)
+        self.noise = noise
+
+    def next_guess(self):
+        middle = (self.low + self.high) / 2
+        guess = round(self.rng.gauss(middle, self.noise * (self.high - self.low)))
+        return min(max(guess, self.low), self.high)
+
+
+SOLVERS = {"binary": BinarySearchSolver, "random": RandomSolver, "noisy": NoisySolver}
+
+
+def play(game, solver):
+    """Let a solver play a game to the end and return the number of attempts."""
+    while True:
+        guess = solver.next_guess()
+        result = game.guess(guess)
+        if result == CORRECT:
+            return game.attempts
+        solver.feedback(guess, result)
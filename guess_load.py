@@ -0,0 +1,111 @@
+import argparse
+import asyncio
+import sys
+import time
+
+from guess_engine import DIFFICULTIES, BinarySearchSolver, TOO_HIGH, TOO_LOW
+from guess_server import start_server
+
+GUESS_PROMPT = "Enter your guess: "
+AGAIN_PROMPT = "Do you want to play again? (y/n): "
+
+
+async def read_until_prompt(reader):
+    lines = []
+    while True:
+        line = (await reader.readline()).decode("utf-8").rstrip("\n")
+        if not line or line in (GUESS_PROMPT, AGAIN_PROMPT):
+            return lines, line
+        lines.append(line)
+
+
+async def play_session(host, port, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        welcome, prompt = await read_until_prompt(reader)
+        range_max = int(welcome[-1].rstrip(".").rsplit(" ", 1)[1])
+        solver = BinarySearchSolver(range_max)
+        while prompt == GUESS_PROMPT:
+            guess = solver.next_guess()
+            start = time.perf_counter()
+            writer.write(f"{guess}\n".encode())
+            reply, prompt = await read_until_prompt(reader)
+            latencies.append(time.perf_counter() - start)
+            if reply[0].startswith("Too low"):
+                solver.feedback(guess, TOO_LOW)
+            elif reply[0].startswith("Too high"):
+                solver.feedback(guess, TOO_HIGH)
+        writer.write(b"n\n")
+        await reader.read()
+    finally:
+        writer.close()
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+async def run_load(host, port, sessions, concurrency):
+    latencies = []
+    limit = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with limit:
+            await play_session(host, port, latencies)
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(one() for _ in range(sessions)), return_exceptions=True)
+    elapsed = time.perf_counter() - start
+    failures = [r for r in results if isinstance(r, Exception)]
+    return elapsed, sorted(latencies), failures
+
+
+def raise_file_limit():
+    # Every open session is a socket; both ends of it when the server runs in-process
+    try:
+        import resource
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft != hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+async def main_async(args):
+    server = None
+    host, port = args.host, args.port
+    if port is None:
+        # No server given: run one in this process on a free port
+        server = await start_server(host, 0, DIFFICULTIES[args.level])
+        port = server.sockets[0].getsockname()[1]
+    try:
+        elapsed, latencies, failures = await run_load(host, port, args.sessions, args.concurrency)
+    finally:
+        if server is not None:
+            server.close()
+    done = args.sessions - len(failures)
+    print(f"{done} sessions in {elapsed:.2f}s ({done / elapsed:.0f} sessions/sec), "
+          f"{len(latencies)} guesses, up to {args.concurrency} concurrent")
+    if latencies:
+        print("guess latency: " + ", ".join(f"p{int(q * 100)} {percentile(latencies, q) * 1000:.2f}ms"
+                                            for q in (0.5, 0.9, 0.99)) + f", max {latencies[-1] * 1000:.2f}ms")
+    if failures:
+        print(f"{len(failures)} sessions failed, e.g. {failures[0]!r}")
+        return 1
+    return 0
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Load test for guess_server.py")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, help="server to test; without it one is started in-process")
+    parser.add_argument("--level", choices=list(DIFFICULTIES), default="Medium")
+    parser.add_argument("--sessions", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=1000)
+    args = parser.parse_args(argv)
+    raise_file_limit()
+    return asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
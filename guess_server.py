@@ -0,0 +1,77 @@
+import argparse
+import asyncio
+import sys
+
+from guess_engine import DIFFICULTIES, Session
+
+MAX_LINE = 256
+
+
+class GuessProtocol(asyncio.Protocol):
+    """One connected player: newline-terminated text in, the session's lines out.
+
+    A bare Protocol instead of stream reader/writer pairs, with __slots__, so a
+    connection costs its transport, a Session and a short input buffer.
+    """
+
+    __slots__ = ("range_max", "transport", "session", "buffer")
+
+    def __init__(self, range_max):
+        self.range_max = range_max
+        self.transport = None
+        self.session = None
+        self.buffer = b""
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.session = Session(self.range_max)
+        self._send(self.session.start())
+
+    def _send(self, lines):
+        prompt = self.session.prompt
+        if prompt is not None:
+            lines = lines + [prompt]
+        self.transport.write("".join(line + "\n" for line in lines).encode("utf-8"))
+        if prompt is None:
+            self.transport.close()
+
+    def data_received(self, data):
+        self.buffer += data
+        while b"\n" in self.buffer and not self.transport.is_closing():
+            line, self.buffer = self.buffer.split(b"\n", 1)
+            self._send(self.session.handle(line.decode("utf-8", "replace")))
+        if len(self.buffer) > MAX_LINE:
+            self.transport.close()
+
+    def connection_lost(self, exc):
+        self.session = None
+        self.buffer = b""
+
+
+async def start_server(host="127.0.0.1", port=5050, range_max=100, backlog=1024):
+    loop = asyncio.get_running_loop()
+    return await loop.create_server(lambda: GuessProtocol(range_max), host, port, backlog=backlog)
+
+
+async def serve(host, port, range_max):
+    server = await start_server(host, port, range_max)
+    print(f"Serving the guessing game (1-{range_max}) on {host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Number guessing game over TCP, one session per connection")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5050)
+    parser.add_argument("--level", choices=list(DIFFICULTIES), default="Medium")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, DIFFICULTIES[args.level]))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
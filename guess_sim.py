@@ -0,0 +1,87 @@
+import argparse
+import sys
+
+import numpy as np
+
+from guess_engine import DIFFICULTIES, SOLVERS
+
+
+def _guesses(strategy, low, high, rng, noise):
+    if strategy == "binary":
+        return (low + high) // 2
+    if strategy == "random":
+        return rng.integers(low, high, endpoint=True)
+    if strategy == "noisy":
+        guesses = np.rint(rng.normal((low + high) / 2, noise * (high - low))).astype(np.int64)
+        return np.clip(guesses, low, high)
+    raise ValueError(f"unknown strategy '{strategy}', expected one of {', '.join(SOLVERS)}")
+
+
+def simulate(range_max, strategy="binary", games=1_000_000, rng=None, noise=0.2):
+    """Play `games` games at once and return each game's attempt count.
+
+    Every game keeps its own [low, high] range. Each round makes one guess in
+    all unfinished games with array operations, then drops the finished ones,
+    so the Python loop runs once per round rather than once per game.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    numbers = rng.integers(1, range_max, size=games, endpoint=True)
+    low = np.ones(games, dtype=np.int64)
+    high = np.full(games, range_max, dtype=np.int64)
+    attempts = np.zeros(games, dtype=np.int64)
+    active = np.arange(games)
+    rounds = 0
+    while len(active):
+        rounds += 1
+        guesses = _guesses(strategy, low, high, rng, noise)
+        too_low = guesses < numbers
+        too_high = guesses > numbers
+        low = np.where(too_low, guesses + 1, low)
+        high = np.where(too_high, guesses - 1, high)
+        playing = too_low | too_high
+        attempts[active[~playing]] = rounds
+        active, numbers, low, high = active[playing], numbers[playing], low[playing], high[playing]
+    return attempts
+
+
+def distribution(attempts):
+    """Fraction of games won at each attempt count, index 0 unused."""
+    return np.bincount(attempts) / len(attempts)
+
+
+def summary(attempts):
+    return {"mean": attempts.mean(), "p50": np.percentile(attempts, 50),
+            "p90": np.percentile(attempts, 90), "p99": np.percentile(attempts, 99), "max": attempts.max()}
+
+
+def print_report(level, strategy, attempts, width=40):
+    stats = summary(attempts)
+    print(f"{level} (1-{DIFFICULTIES[level]}), {strategy}: {len(attempts)} games, mean {stats['mean']:.2f}, "
+          f"p50 {stats['p50']:.0f}, p90 {stats['p90']:.0f}, p99 {stats['p99']:.0f}, max {stats['max']}")
+    shares = distribution(attempts)
+    for count in range(1, len(shares)):
+        if shares[count] >= 0.0005:
+            print(f"  {count:3} {shares[count]:7.2%} {'#' * round(shares[count] / shares.max() * width)}")
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Attempt-count distributions for the guessing game")
+    parser.add_argument("--games", type=int, default=1_000_000)
+    parser.add_argument("--strategy", choices=list(SOLVERS) + ["all"], default="all")
+    parser.add_argument("--level", choices=list(DIFFICULTIES) + ["all"], default="all")
+    parser.add_argument("--noise", type=float, default=0.2, help="spread of the noisy strategy")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    levels = list(DIFFICULTIES) if args.level == "all" else [args.level]
+    strategies = list(SOLVERS) if args.strategy == "all" else [args.strategy]
+    for level in levels:
+        for strategy in strategies:
+            print_report(level, strategy, simulate(DIFFICULTIES[level], strategy, args.games, rng, args.noise))
+            print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
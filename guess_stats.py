@@ -0,0 +1,87 @@
+import math
+import sqlite3
+import time
+
+# games holds every finished game. attempt_counts is a histogram per difficulty
+# kept up to date by triggers, so percentiles read at most a few hundred rows
+# however many games are stored, and best scores come straight off an index.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS games (
+    id INTEGER PRIMARY KEY,
+    difficulty TEXT NOT NULL,
+    attempts INTEGER NOT NULL,
+    finished_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS games_by_score ON games (difficulty, attempts, finished_at);
+CREATE INDEX IF NOT EXISTS games_by_time ON games (difficulty, finished_at);
+
+CREATE TABLE IF NOT EXISTS attempt_counts (
+    difficulty TEXT NOT NULL,
+    attempts INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (difficulty, attempts)
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS count_game AFTER INSERT ON games BEGIN
+    INSERT INTO attempt_counts (difficulty, attempts, count) VALUES (new.difficulty, new.attempts, 1)
+    ON CONFLICT (difficulty, attempts) DO UPDATE SET count = count + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS uncount_game AFTER DELETE ON games BEGIN
+    UPDATE attempt_counts SET count = count - 1
+    WHERE difficulty = old.difficulty AND attempts = old.attempts;
+END;
+"""
+
+
+class GameStats:
+    def __init__(self, path="guess_stats.db"):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+
+    def record(self, difficulty, attempts, finished_at=None):
+        with self.db:
+            self.db.execute("INSERT INTO games (difficulty, attempts, finished_at) VALUES (?, ?, ?)",
+                            (difficulty, attempts, time.time() if finished_at is None else finished_at))
+
+    def record_many(self, rows):
+        """Insert (difficulty, attempts, finished_at) rows in one transaction."""
+        with self.db:
+            self.db.executemany("INSERT INTO games (difficulty, attempts, finished_at) VALUES (?, ?, ?)", rows)
+
+    def histogram(self, difficulty):
+        return self.db.execute("SELECT attempts, count FROM attempt_counts WHERE difficulty = ? AND count > 0 "
+                               "ORDER BY attempts", (difficulty,)).fetchall()
+
+    def count(self, difficulty):
+        return sum(count for attempts, count in self.histogram(difficulty))
+
+    def percentiles(self, difficulty, fractions=(0.5, 0.9, 0.99)):
+        """Nearest-rank percentiles of attempts, or None for each when nothing is recorded."""
+        histogram = self.histogram(difficulty)
+        total = sum(count for attempts, count in histogram)
+        results = []
+        for fraction in fractions:
+            if not total:
+                results.append(None)
+                continue
+            rank = max(1, math.ceil(fraction * total))
+            seen = 0
+            for attempts, count in histogram:
+                seen += count
+                if seen >= rank:
+                    results.append(attempts)
+                    break
+        return results
+
+    def best(self, difficulty, limit=10):
+        """Fewest-attempt games, earliest first among ties."""
+        return self.db.execute("SELECT attempts, finished_at FROM games WHERE difficulty = ? "
+                               "ORDER BY attempts, finished_at LIMIT ?", (difficulty, limit)).fetchall()
+
+    def recent(self, difficulty, limit=10):
+        return self.db.execute("SELECT attempts, finished_at FROM games WHERE difficulty = ? "
+                               "ORDER BY finished_at DESC LIMIT ?", (difficulty, limit)).fetchall()
+
+    def close(self):
+        self.db.close()
@@ -0,0 +1,55 @@
+import tkinter as tk
+from datetime import datetime
+from tkinter import ttk
+
+from guess_engine import DIFFICULTIES
+
+
+class StatsPanel(tk.Toplevel):
+    """Games played, best score and attempt percentiles per level, plus the top scores of one level."""
+
+    def __init__(self, master, stats, difficulty="Medium", limit=10):
+        super().__init__(master)
+        self.title("Statistics")
+        self.geometry("420x360")
+        self.stats = stats
+        self.limit = limit
+
+        columns = ("games", "best", "p50", "p90", "p99")
+        self.summary = ttk.Treeview(self, columns=columns, height=len(DIFFICULTIES))
+        self.summary.heading("#0", text="Level")
+        self.summary.column("#0", width=80)
+        for column, title in zip(columns, ("Games", "Best", "Median", "90%", "99%")):
+            self.summary.heading(column, text=title)
+            self.summary.column(column, width=60, anchor="e")
+        self.summary.pack(fill=tk.X, padx=8, pady=8)
+
+        self.level = tk.StringVar(value=difficulty)
+        level_frame = ttk.Frame(self)
+        level_frame.pack(fill=tk.X, padx=8)
+        ttk.Label(level_frame, text="Best scores:").pack(side=tk.LEFT)
+        for level in DIFFICULTIES:
+            ttk.Radiobutton(level_frame, text=level, variable=self.level, value=level,
+                            command=self._show_best).pack(side=tk.LEFT, padx=4)
+
+        self.best = tk.Listbox(self, activestyle="none")
+        self.best.pack(fill=tk.BOTH, expand=True, padx=8, pady=8)
+
+        self.refresh()
+
+    def refresh(self):
+        self.summary.delete(*self.summary.get_children())
+        for level in DIFFICULTIES:
+            count = self.stats.count(level)
+            best = self.stats.best(level, 1)
+            p50, p90, p99 = self.stats.percentiles(level)
+            values = [count] + [value if value is not None else "-" for value in
+                                (best[0][0] if best else None, p50, p90, p99)]
+            self.summary.insert("", tk.END, text=level, values=values)
+        self._show_best()
+
+    def _show_best(self):
+        self.best.delete(0, tk.END)
+        for rank, (attempts, finished_at) in enumerate(self.stats.best(self.level.get(), self.limit), 1):
+            when = datetime.fromtimestamp(finished_at).strftime("%Y-%m-%d %H:%M")
+            self.best.insert(tk.END, f"{rank:2}.  {attempts} attempts   {when}")
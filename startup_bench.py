@@ -0,0 +1,119 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+HISTORY_PATH = "startup_history.jsonl"
+
+ENTRY_POINTS = [
+    "01_hello_world.py",
+    "02_number_guessing_GUI.py",
+    "03_calculator_gui.py",
+    "03_calculator_gui_v2.py",
+    "04_to-do_app.py",
+]
+
+# Runs one entry point as __main__ in a fresh interpreter. The first Tk() marks
+# the end of the imports, mainloop() the end of window construction, and the
+# update() inside it the first drawn frame; the process exits right after.
+DRIVER = r"""
+import time
+start = time.perf_counter()
+import json, os, runpy, sys, tkinter
+
+marks = {}
+tk_init = tkinter.Tk.__init__
+
+def init(self, *args, **kwargs):
+    marks.setdefault("imported", time.perf_counter())
+    tk_init(self, *args, **kwargs)
+
+def mainloop(self, n=0):
+    marks["built"] = time.perf_counter()
+    self.update()
+    marks["first_frame"] = time.perf_counter()
+    print(json.dumps({"import_ms": (marks["imported"] - start) * 1000,
+                      "build_ms": (marks["built"] - marks["imported"]) * 1000,
+                      "frame_ms": (marks["first_frame"] - marks["built"]) * 1000}))
+    sys.stdout.flush()
+    os._exit(0)
+
+tkinter.Tk.__init__ = init
+tkinter.Misc.mainloop = mainloop
+sys.argv = [sys.argv[1]]
+runpy.run_path(sys.argv[0], run_name="__main__")
+"""
+
+
+def profile(script, runs=5):
+    """Median phase times of `runs` cold starts; total_ms includes interpreter startup."""
+    samples = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        proc = subprocess.run([sys.executable, "-c", DRIVER, script], cwd=HERE,
+                              capture_output=True, text=True, timeout=60)
+        total = (time.perf_counter() - t0) * 1000
+        if proc.returncode != 0 or not proc.stdout.strip():
+            error = (proc.stderr.strip().splitlines() or ["no output"])[-1]
+            return {"error": error}
+        sample = json.loads(proc.stdout.strip().splitlines()[-1])
+        sample["total_ms"] = total
+        samples.append(sample)
+    return {key: statistics.median(s[key] for s in samples) for key in samples[0]}
+
+
+def last_record(path):
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        lines = f.read().splitlines()
+    return json.loads(lines[-1]) if lines else None
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE,
+                              capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ""
+
+
+def print_results(results, previous=None):
+    print(f"{'entry point':28}{'import':>10}{'build':>10}{'frame':>10}{'total':>10}{'vs last':>9}")
+    for script, r in results.items():
+        if "error" in r:
+            print(f"{script:28}  failed: {r['error']}")
+            continue
+        change = ""
+        old = (previous or {}).get("results", {}).get(script)
+        if old and "total_ms" in old:
+            change = f"{r['total_ms'] / old['total_ms'] - 1:+.0%}"
+        print(f"{script:28}{r['import_ms']:8.1f}ms{r['build_ms']:8.1f}ms{r['frame_ms']:8.1f}ms"
+              f"{r['total_ms']:8.1f}ms{change:>9}")
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Cold-start time of each GUI entry point")
+    parser.add_argument("scripts", nargs="*", default=ENTRY_POINTS)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--history", default=HISTORY_PATH)
+    parser.add_argument("--no-record", action="store_true", help="do not append this run to the history")
+    args = parser.parse_args(argv)
+
+    results = {script: profile(script, args.runs) for script in args.scripts}
+    previous = last_record(args.history)
+    print_results(results, previous)
+
+    if not args.no_record:
+        record = {"time": time.strftime("%Y-%m-%dT%H:%M:%S"), "revision": git_revision(), "results": results}
+        with open(args.history, "a") as f:
+            f.write(json.dumps(record) + "\n")
+    return 1 if any("error" in r for r in results.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
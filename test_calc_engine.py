@@ -0,0 +1,65 @@
+import time
+from decimal import Decimal
+
+import pytest
+
+from calc_engine import MAX_NODES, ExpressionEngine, ExpressionError
+
+# Every rejected expression has to be rejected quickly, not after doing the work
+TIME_LIMIT = 2.0
+
+
+@pytest.mark.parametrize("expression", [
+    "9**9**9",
+    "factorial(10**6)",
+    "comb(10**6, 5*10**5)",
+    "2**2**2**2**2",
+    "+".join(["1"] * MAX_NODES),
+])
+def test_worst_cases_are_rejected_in_bounded_time(expression):
+    engine = ExpressionEngine()
+    start = time.perf_counter()
+    with pytest.raises(ExpressionError):
+        engine.evaluate(expression)
+    assert time.perf_counter() - start < TIME_LIMIT
+
+
+def test_long_addition_chain_still_compiles():
+    terms = MAX_NODES // 4
+    assert ExpressionEngine().evaluate("+".join(["1"] * terms)) == terms
+
+
+def test_folding_huge_constants_reports_the_real_error():
+    # Folded ints past the int-to-str digit limit must not break compilation
+    with pytest.raises(ValueError, match="math domain error"):
+        ExpressionEngine().evaluate("2**20000 + sqrt(-1)")
+    assert ExpressionEngine().evaluate("2**20000 - 2**20000 + 1") == 1
+
+
+@pytest.mark.parametrize("expression, expected", [
+    ("2**-1", "0.5"),
+    ("0.1 + 2**-1", "0.6"),
+    ("1/4 + 10**-2", "0.26"),
+    ("(-2)**-3", "-0.125"),
+])
+def test_decimal_negative_int_powers_stay_decimal(expression, expected):
+    result = ExpressionEngine(mode="decimal").evaluate(expression)
+    assert isinstance(result, Decimal)
+    assert result == Decimal(expected)
+
+
+@pytest.mark.parametrize("mode, precision", [("decimal", 0), ("decimal", -5), ("decimal", 2.5), ("binary", 10)])
+def test_rejected_mode_change_leaves_the_engine_working(mode, precision):
+    engine = ExpressionEngine(mode="decimal", precision=10)
+    with pytest.raises(ValueError):
+        engine.set_mode(mode, precision)
+    assert (engine.mode, engine.precision) == ("decimal", 10)
+    assert engine.evaluate("1/3") == Decimal("0.3333333333")
+
+
+@pytest.mark.parametrize("precision", [10, 50, 100])
+def test_decimal_constants_use_the_engine_precision(precision):
+    engine = ExpressionEngine(mode="decimal", precision=precision)
+    for name in ("pi", "tau", "e"):
+        assert len(engine.evaluate(name).as_tuple().digits) == precision
+    assert engine.evaluate("tau - 2*pi") == 0
@@ -0,0 +1,10 @@
+from calc_history import History
+
+
+def test_append_logs_results_too_large_to_print(tmp_path):
+    history = History(str(tmp_path / "history.log"))
+    history.append("2**20000", 2 ** 20000)
+    history.append("1+1", 2)
+    assert history.get(0) == ("2**20000", "3.980276840337967e+6020")
+    assert history.get(1) == ("1+1", "2")
+    history.close()
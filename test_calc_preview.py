@@ -0,0 +1,41 @@
+import pytest
+
+from calc_engine import ExpressionEngine, ExpressionError
+from calc_preview import PreviewEvaluator
+from calc_tokens import TokenStream, tokenize
+
+
+@pytest.mark.parametrize("malformed, text, value", [
+    ("4 2", "42", 42),
+    ("2* *3", "2**3", 8),
+])
+def test_malformed_preview_does_not_poison_text_compiles(malformed, text, value):
+    # Tokens that print as valid text must not share its cache slot
+    engine = ExpressionEngine()
+    with pytest.raises(ExpressionError):
+        PreviewEvaluator(engine).evaluate(tokenize(malformed, implicit=False))
+    assert engine.evaluate(text) == value
+
+
+@pytest.mark.parametrize("prefix, separator, keys", [
+    ("", "+", "+75-2"),
+    ("2*(", "+", "+75)*2"),
+    ("1+3*(4-(", "-", "-7)/5)+2"),
+    ("", "*", "*75/2"),
+])
+def test_typing_reuses_finished_groups_and_factors(prefix, separator, keys, monkeypatch):
+    engine = ExpressionEngine()
+    calls = []
+    for name in ("run", "apply"):
+        monkeypatch.setattr(engine, name, lambda *args, f=getattr(engine, name): calls.append(1) or f(*args))
+    evaluator = PreviewEvaluator(engine)
+    stream = TokenStream()
+    stream.append(prefix + separator.join(["1.5"] * 300))
+    evaluator.evaluate(stream.snapshot())
+    # Each key costs the same however much was typed before it
+    for key in keys:
+        stream.append(key)
+        del calls[:]
+        value = evaluator.evaluate(stream.snapshot())
+        assert len(calls) <= 8
+        assert value == PreviewEvaluator(ExpressionEngine()).evaluate(stream.snapshot())
@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+from calc_tokens import TokenStream
+
+FUNCTIONS = {"sin", "cos", "sqrt", "log"}
+
+TEXTS = [
+    "1e+20*2", "2.5e-05", "1e5", "1E5x", "2e", "2e+", "2e+x", "2e5.3", "1e5e", "1 e5",
+    "xe5", "3(4)", "2pi", "sin(2)cos(3)", "2^3", "7//2**3", ".e5", "1.5e3+e",
+]
+
+
+def _tokens(stream):
+    return [tuple(token) for token in stream.snapshot()]
+
+
+def _reset(text):
+    return _tokens(TokenStream(FUNCTIONS, text))
+
+
+def _check(text):
+    expected = _reset(text)
+    typed = TokenStream(FUNCTIONS)
+    for ch in text:
+        typed.append(ch)
+    assert _tokens(typed) == expected
+    chunk = TokenStream(FUNCTIONS)
+    chunk.append(text)
+    assert _tokens(chunk) == expected
+    # Backspacing from the full text passes through every prefix
+    for length in range(len(text) - 1, -1, -1):
+        typed.pop()
+        assert typed.text == text[:length]
+        assert _tokens(typed) == _reset(text[:length])
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_append_reset_and_pop_agree(text):
+    _check(text)
+
+
+def test_append_reset_and_pop_agree_on_random_input():
+    rng = random.Random(6)
+    alphabet = "0123456789.eE+-*/^()x ,"
+    for _ in range(2000):
+        _check("".join(rng.choice(alphabet) for _ in range(rng.randint(1, 10))))
+
+
+def _press(*keys):
+    # Names go in the way the calculator's buttons insert them
+    stream = TokenStream(FUNCTIONS)
+    for key in keys:
+        if key == "back":
+            stream.pop()
+        elif key.isalpha():
+            stream.append(key, close=True)
+        else:
+            stream.append(key)
+    return [token.text for token in stream.snapshot()]
+
+
+@pytest.mark.parametrize("keys, expected", [
+    (("pi", "2"), ["pi", "*", "2"]),
+    (("pi", "2", "back", "2"), ["pi", "*", "2"]),
+    (("pi", "e", "back", "e"), ["pi", "*", "e"]),
+    (("2", "e", "5"), ["2", "*", "e", "*", "5"]),
+    (("2", "e", "5", "back", "back", "5"), ["25"]),
+])
+def test_button_names_stay_closed_after_backspace(keys, expected):
+    assert _press(*keys) == expected
@@ -0,0 +1,150 @@
+import json
+import os
+import threading
+
+# The task list is a JSON snapshot plus a journal of the changes made since,
+# one JSON record per line. Compaction moves the journal aside and folds it
+# into a new snapshot on a background thread. Replaying a record twice has no
+# further effect, so a crash at any point of compaction loses nothing: load
+# simply replays whatever snapshot and journals are on disk. The snapshot also
+# records the next free id, so ids of deleted tasks are never handed out again.
+
+
+def apply_record(tasks, record):
+    """Apply one journal record to tasks, a dict of task dicts by id in entry order."""
+    op = record["op"]
+    if op == "add":
+        task = record["task"]
+        if task["id"] not in tasks:
+            tasks[task["id"]] = dict(task)
+    elif op == "update":
+        task = tasks.get(record["id"])
+        if task is not None:
+            task.update(record["fields"])
+    elif op == "delete":
+        for task_id in record["ids"]:
+            tasks.pop(task_id, None)
+
+
+def replay(tasks, next_id, records):
+    """Apply records in order; returns the next id no task has used."""
+    for record in records:
+        apply_record(tasks, record)
+        if record["op"] == "add":
+            next_id = max(next_id, record["task"]["id"] + 1)
+    return next_id
+
+
+def read_records(path):
+    """The records in a journal file, and the length of its intact part."""
+    records, length = [], 0
+    if not os.path.exists(path):
+        return records, length
+    with open(path, "rb") as f:
+        for line in f:
+            try:
+                if not line.endswith(b"\n"):
+                    raise ValueError("incomplete record")
+                records.append(json.loads(line))
+            except ValueError:
+                # Torn final write from a crash: everything before it is intact
+                break
+            length += len(line)
+    return records, length
+
+
+def read_snapshot(path):
+    """Task dicts by id in entry order, and the next free id."""
+    if not os.path.exists(path):
+        return {}, 1
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    # Older files are a bare list of tasks
+    rows = data["tasks"] if isinstance(data, dict) else data
+    # Files written before tasks had ids get them by position, the same on every load
+    tasks = {row.get("id", n): dict(row, id=row.get("id", n)) for n, row in enumerate(rows, 1)}
+    next_id = max(tasks, default=0) + 1
+    if isinstance(data, dict):
+        next_id = max(next_id, data.get("next_id", 1))
+    return tasks, next_id
+
+
+def write_snapshot(path, rows, next_id, indent=None):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"next_id": next_id, "tasks": list(rows)}, f, indent=indent)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class Journal:
+    def __init__(self, snapshot_path, compact_every=1000):
+        self.snapshot_path = snapshot_path
+        self.path = snapshot_path + ".journal"
+        self.compacting_path = snapshot_path + ".journal.compacting"
+        self.compact_every = compact_every
+        self.records = 0
+        self._file = None
+        self._compactor = None
+
+    def load(self):
+        """Task dicts in entry order, the snapshot with every journal replayed on top, and the next free id."""
+        tasks, next_id = read_snapshot(self.snapshot_path)
+        for path in (self.compacting_path, self.path):
+            records, length = read_records(path)
+            next_id = replay(tasks, next_id, records)
+            self.records += len(records)
+        if os.path.exists(self.path) and os.path.getsize(self.path) > length:
+            # Cut off a torn record so new ones start on a line of their own
+            os.truncate(self.path, length)
+        self._file = open(self.path, "a", encoding="utf-8")
+        if os.path.exists(self.compacting_path):
+            # A compaction was interrupted; finish it
+            self._start_compactor()
+        return list(tasks.values()), next_id
+
+    def append(self, record):
+        # Buffered until flush(), so a burst of changes costs one write and one fsync
+        self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        self.records += 1
+        if self.records >= self.compact_every:
+            self.compact()
+
+    def flush(self):
+        """Hand buffered records to the OS; returns a descriptor to fsync and close.
+
+        The fsync can then run without holding whatever guards append(): the
+        descriptor stays valid even if compaction moves the file meanwhile.
+        """
+        self._file.flush()
+        return os.dup(self._file.fileno())
+
+    def compact(self, wait=False):
+        if self._compactor is None or not self._compactor.is_alive():
+            if not os.path.exists(self.compacting_path):
+                self._file.close()
+                os.replace(self.path, self.compacting_path)
+                self._file = open(self.path, "a", encoding="utf-8")
+                self.records = 0
+            self._start_compactor()
+        if wait:
+            self._compactor.join()
+
+    def _start_compactor(self):
+        # Not a daemon: the interpreter waits for a running compaction at exit
+        self._compactor = threading.Thread(target=self._compact, name="todo-compactor")
+        self._compactor.start()
+
+    def _compact(self):
+        tasks, next_id = read_snapshot(self.snapshot_path)
+        next_id = replay(tasks, next_id, read_records(self.compacting_path)[0])
+        write_snapshot(self.snapshot_path, tasks.values(), next_id)
+        os.remove(self.compacting_path)
+
+    def close(self):
+        if self._compactor is not None:
+            self._compactor.join()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
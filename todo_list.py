@@ -0,0 +1,133 @@
+import math
+
+import ttkbootstrap as tb
+from ttkbootstrap.constants import *
+
+
+class VirtualTaskList(tb.Frame):
+    """Scrolling task list that only has widgets for the rows on screen.
+
+    tasks can be any sequence (a list or a TaskView). A pool of checkbuttons,
+    one per visible row, is bound to whichever tasks are scrolled into view,
+    so drawing the list costs the same for ten tasks or a million.
+
+    Rows are keyed by task id. A refresh keeps each task that stays on screen
+    on the row that already shows it and only reconfigures what differs, so
+    adding or deleting a task touches the rows that move, not every row.
+    """
+
+    def __init__(self, master, on_toggle, on_edit, **kwargs):
+        super().__init__(master, **kwargs)
+        self.on_toggle = on_toggle
+        self.on_edit = on_edit
+        self.tasks = []
+        self.top = 0
+        self.rows = []
+        self.rows_by_id = {}
+        self.row_height = None
+
+        self.body = tb.Frame(self)
+        self.body.pack(side=LEFT, fill=BOTH, expand=YES)
+        self.scrollbar = tb.Scrollbar(self, orient=VERTICAL, command=self.yview)
+        self.scrollbar.pack(side=RIGHT, fill=Y)
+
+        self.body.bind("<Configure>", lambda e: self.refresh())
+        self._bind_wheel(self.body)
+
+    def _bind_wheel(self, widget):
+        widget.bind("<MouseWheel>", lambda e: self.yview("scroll", -1 if e.delta > 0 else 1, "units"))
+        widget.bind("<Button-4>", lambda e: self.yview("scroll", -1, "units"))
+        widget.bind("<Button-5>", lambda e: self.yview("scroll", 1, "units"))
+
+    def _make_row(self):
+        var = tb.BooleanVar()
+        row = tb.Checkbutton(self.body, variable=var, bootstyle="secondary-round-toggle")
+        row.var = var
+        row.index = None
+        row.task_id = None
+        row.y = None
+        row.text = ""
+        row.style = "secondary-round-toggle"
+        row.configure(command=lambda: self.on_toggle(row.index, var.get()))
+        row.bind("<Double-1>", lambda e: self.on_edit(row.index))
+        self._bind_wheel(row)
+        self.rows.append(row)
+        return row
+
+    def set_tasks(self, tasks):
+        self.tasks = tasks
+        self.refresh()
+
+    def _scroll_limit(self):
+        return max(0, len(self.tasks) * self.row_height - self.body.winfo_height())
+
+    def yview(self, *args):
+        if self.row_height is None:
+            return
+        if args[0] == "moveto":
+            self.top = float(args[1]) * len(self.tasks) * self.row_height
+        elif args[0] == "scroll":
+            step = self.row_height if args[2] == "units" else self.body.winfo_height()
+            self.top += int(args[1]) * step
+        self.refresh()
+
+    def refresh(self):
+        """Bind the rows on screen to the tasks at the current scroll position."""
+        if self.row_height is None:
+            # Row height comes from a real row, so it follows the theme's font
+            self.row_height = self._make_row().winfo_reqheight() + 4
+        height = self.body.winfo_height()
+        self.top = min(max(self.top, 0), self._scroll_limit())
+        first = int(self.top // self.row_height)
+        count = min(len(self.tasks) - first, math.ceil(height / self.row_height) + 1)
+        while len(self.rows) < count:
+            self._make_row()
+
+        visible = [(first + n, self.tasks[first + n]) for n in range(count)]
+        kept = {task.id: self.rows_by_id[task.id] for index, task in visible if task.id in self.rows_by_id}
+        kept_rows = {id(row) for row in kept.values()}
+        free = [row for row in self.rows if id(row) not in kept_rows]
+        self.rows_by_id = {}
+        for index, task in visible:
+            row = kept.get(task.id)
+            if row is None:
+                row = free.pop()
+            self._bind_row(row, index, task)
+            self.rows_by_id[task.id] = row
+        for row in free:
+            if row.task_id is not None:
+                row.place_forget()
+                row.index = row.task_id = row.y = None
+
+        total = len(self.tasks) * self.row_height
+        if total <= height:
+            self.scrollbar.set(0, 1)
+        else:
+            self.scrollbar.set(self.top / total, (self.top + height) / total)
+
+    def update_task(self, task):
+        """Redraw the one row showing task, if it is on screen; the list is otherwise unchanged."""
+        row = self.rows_by_id.get(task.id)
+        if row is not None:
+            self._bind_row(row, row.index, task)
+
+    def _bind_row(self, row, index, task):
+        # Only what differs from the row's last task is sent to Tk
+        row.index = index
+        row.task_id = task.id
+        text = task.text
+        if task.due_date:
+            text += f" (Due: {task.due_date})"
+        style = "success-round-toggle" if task.done else "secondary-round-toggle"
+        if row.text != text:
+            row.configure(text=text)
+            row.text = text
+        if row.style != style:
+            row.configure(bootstyle=style)
+            row.style = style
+        if row.var.get() != task.done:
+            row.var.set(task.done)
+        y = index * self.row_height - self.top + 2
+        if row.y != y:
+            row.place(x=5, y=y)
+            row.y = y
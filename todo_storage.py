@@ -0,0 +1,253 @@
+import os
+import threading
+from collections import OrderedDict
+
+from todo_journal import Journal, read_snapshot, write_snapshot
+
+# Backends store tasks as {"id", "text", "done", "due_date"} dicts. Ids are
+# handed out by the backend, never reused, and also give the entry order.
+# Changes are made on the Tk thread; save() makes them durable and may run on
+# a writer thread, so both go through the backend's lock.
+SORT_KEYS = {
+    "entry": None,
+    "alphabet": lambda row: row["text"].lower(),
+    "length": lambda row: len(row["text"]),
+    "due_date": lambda row: row["due_date"] or "9999-12-31",
+}
+
+
+class JsonBackend:
+    """All tasks in memory, saved as one JSON file or as a snapshot plus journal."""
+
+    def __init__(self, filepath="tasks.json", journal=False):
+        self.filepath = filepath
+        self.rows = {}
+        self.next_id = 1
+        self.lock = threading.Lock()
+        # Journal mode appends each change as one record instead of rewriting the file
+        self.journal = Journal(filepath) if journal else None
+
+    def _log(self, record):
+        if self.journal is not None:
+            self.journal.append(record)
+
+    def load(self):
+        if self.journal is not None:
+            rows, self.next_id = self.journal.load()
+            self.rows = {row["id"]: row for row in rows}
+        else:
+            self.rows, self.next_id = read_snapshot(self.filepath)
+
+    def add(self, row):
+        with self.lock:
+            row = dict(row, id=self.next_id)
+            self.next_id += 1
+            self.rows[row["id"]] = row
+            self._log({"op": "add", "task": row})
+        return row["id"]
+
+    def update(self, task_id, fields):
+        with self.lock:
+            self.rows[task_id] = dict(self.rows[task_id], **fields)
+            self._log({"op": "update", "id": task_id, "fields": fields})
+
+    def delete(self, ids):
+        with self.lock:
+            for task_id in ids:
+                self.rows.pop(task_id, None)
+            self._log({"op": "delete", "ids": list(ids)})
+
+    def delete_done(self):
+        ids = [task_id for task_id, row in self.rows.items() if row["done"]]
+        if ids:
+            self.delete(ids)
+        return len(ids)
+
+    def save(self):
+        # Only copying state holds the lock; the disk is waited on outside it
+        with self.lock:
+            if self.journal is not None:
+                # The changes are already in the journal; only its buffer is left
+                fd = self.journal.flush()
+            else:
+                # Rows are replaced, never changed in place, so a shallow copy is a consistent snapshot
+                rows = list(self.rows.values())
+                next_id = self.next_id
+        if self.journal is None:
+            write_snapshot(self.filepath, rows, next_id, indent=2)
+            return
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def view(self, order="entry", done=None, make=dict):
+        rows = [row for row in self.rows.values() if done is None or row["done"] == done]
+        if SORT_KEYS[order] is not None:
+            rows.sort(key=SORT_KEYS[order])
+        return [make(row) for row in rows]
+
+    def due(self, start, end):
+        return [dict(row) for row in self.rows.values()
+                if not row["done"] and row["due_date"] and start <= row["due_date"] <= end]
+
+    def close(self):
+        if self.journal is not None:
+            self.save()
+            self.journal.close()
+
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    text TEXT NOT NULL,
+    done INTEGER NOT NULL DEFAULT 0,
+    due_date TEXT
+);
+CREATE INDEX IF NOT EXISTS tasks_by_done ON tasks (done, id);
+CREATE INDEX IF NOT EXISTS tasks_by_due ON tasks (coalesce(due_date, '9999-12-31'), id);
+CREATE INDEX IF NOT EXISTS tasks_by_open_due ON tasks (done, due_date);
+CREATE INDEX IF NOT EXISTS tasks_by_text ON tasks (lower(text), id);
+CREATE INDEX IF NOT EXISTS tasks_by_length ON tasks (length(text), id);
+"""
+
+# Every order matches one of the indexes above, so pages come off an index scan
+SQLITE_ORDERS = {
+    "entry": "id",
+    "alphabet": "lower(text), id",
+    "length": "length(text), id",
+    "due_date": "coalesce(due_date, '9999-12-31'), id",
+}
+
+
+class TaskView:
+    """Read-only sequence of tasks in one order, fetched a page at a time.
+
+    Only the pages that are indexed get loaded, and only the most recent few
+    are kept, so a list of a million tasks costs a few hundred rows of memory.
+    """
+
+    def __init__(self, backend, order, done, make, page_size=200, pages=8):
+        self.backend = backend
+        self.order = order
+        self.done = done
+        self.make = make
+        self.page_size = page_size
+        self.pages = pages
+        self._length = None
+        self._cache = OrderedDict()
+
+    def __len__(self):
+        if self._length is None:
+            self._length = self.backend.count(self.done)
+        return self._length
+
+    def _page(self, number):
+        page = self._cache.get(number)
+        if page is None:
+            rows = self.backend.query(self.order, self.done, number * self.page_size, self.page_size)
+            page = [self.make(row) for row in rows]
+            self._cache[number] = page
+            if len(self._cache) > self.pages:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(number)
+        return page
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("task index out of range")
+        number, offset = divmod(index, self.page_size)
+        return self._page(number)[offset]
+
+    def __iter__(self):
+        for number in range(-(-len(self) // self.page_size)):
+            yield from self._page(number)
+
+
+class SqliteBackend:
+    """Tasks in an SQLite file; sorting, filtering and counting run as indexed queries."""
+
+    def __init__(self, path="tasks.db"):
+        self.path = path
+        self.db = None
+        self._sync_db = None
+        self.lock = threading.Lock()
+
+    def load(self):
+        # Imported here so the default JSON storage does not load sqlite3 at startup
+        import sqlite3
+        self.db = sqlite3.connect(self.path, check_same_thread=False)
+        # In WAL mode with synchronous=NORMAL a commit only appends to the log and
+        # never waits for the disk; save() syncs the log on a connection of its own
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SQLITE_SCHEMA)
+        self._sync_db = sqlite3.connect(self.path, check_same_thread=False)
+
+    @staticmethod
+    def _row(values):
+        task_id, text, done, due_date = values
+        return {"id": task_id, "text": text, "done": bool(done), "due_date": due_date}
+
+    # Changes stay in an open transaction until save() commits them
+
+    def add(self, row):
+        with self.lock:
+            cursor = self.db.execute("INSERT INTO tasks (text, done, due_date) VALUES (?, ?, ?)",
+                                     (row["text"], row.get("done", False), row.get("due_date")))
+        return cursor.lastrowid
+
+    def update(self, task_id, fields):
+        columns = [name for name in fields if name in ("text", "done", "due_date")]
+        if columns:
+            with self.lock:
+                self.db.execute(f"UPDATE tasks SET {', '.join(f'{name} = ?' for name in columns)} WHERE id = ?",
+                                [fields[name] for name in columns] + [task_id])
+
+    def delete(self, ids):
+        with self.lock:
+            self.db.executemany("DELETE FROM tasks WHERE id = ?", [(task_id,) for task_id in ids])
+
+    def delete_done(self):
+        with self.lock:
+            return self.db.execute("DELETE FROM tasks WHERE done = 1").rowcount
+
+    def save(self):
+        with self.lock:
+            self.db.commit()
+        # Outside the lock: the checkpoint fsyncs the log and copies it into the database
+        # while the Tk thread keeps reading and writing through its own connection
+        self._sync_db.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+    def count(self, done=None):
+        with self.lock:
+            if done is None:
+                return self.db.execute("SELECT count(*) FROM tasks").fetchone()[0]
+            return self.db.execute("SELECT count(*) FROM tasks WHERE done = ?", (done,)).fetchone()[0]
+
+    def query(self, order="entry", done=None, offset=0, limit=-1):
+        where = "" if done is None else "WHERE done = ?"
+        params = () if done is None else (done,)
+        sql = (f"SELECT id, text, done, due_date FROM tasks {where} "
+               f"ORDER BY {SQLITE_ORDERS[order]} LIMIT ? OFFSET ?")
+        with self.lock:
+            return [self._row(values) for values in self.db.execute(sql, params + (limit, offset))]
+
+    def view(self, order="entry", done=None, make=dict):
+        return TaskView(self, order, done, make)
+
+    def due(self, start, end):
+        with self.lock:
+            return [self._row(values) for values in self.db.execute(
+                "SELECT id, text, done, due_date FROM tasks WHERE done = 0 AND due_date BETWEEN ? AND ? "
+                "ORDER BY due_date", (start, end))]
+
+    def close(self):
+        if self.db is not None:
+            self.save()
+            self.db.close()
+            self._sync_db.close()
+            self.db = self._sync_db = None
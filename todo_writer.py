@@ -0,0 +1,96 @@
+import atexit
+import logging
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+
+class BackgroundWriter:
+    """Runs save on a worker thread so the Tk thread never waits for the disk.
+
+    request() only marks the tasks dirty. The worker waits until the changes
+    have been quiet for delay seconds, then saves once, so a burst of clicks
+    becomes one write; changes made during a write are picked up by the next.
+    Steady activity is still written at least every max_delay seconds.
+    """
+
+    def __init__(self, save, delay=0.3, max_delay=2.0):
+        self.save = save
+        self.delay = delay
+        self.max_delay = max_delay
+        self.requests = 0
+        self.latencies = []
+        self.error = None
+        self._closed = False
+        self._dirty = False
+        self._last_request = 0.0
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="todo-writer", daemon=True)
+        self._thread.start()
+        # Also covers an exit that skips the window's close handler
+        atexit.register(self.flush)
+
+    def request(self):
+        self.requests += 1
+        self._last_request = time.monotonic()
+        self._dirty = True
+        self._wake.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait()
+            # Wait out the burst; flush() cuts the wait short
+            deadline = time.monotonic() + self.max_delay
+            while not self._stop.is_set():
+                now = time.monotonic()
+                quiet = now - self._last_request
+                if quiet >= self.delay or now >= deadline:
+                    break
+                self._stop.wait(min(self.delay - quiet, deadline - now))
+            self._wake.clear()
+            self._write()
+
+    def _write(self):
+        if not self._dirty:
+            return
+        self._dirty = False
+        start = time.perf_counter()
+        try:
+            self.save()
+        except Exception as exc:
+            # Keep the changes pending so the next write retries them
+            log.warning("Saving tasks failed, will retry: %r", exc)
+            self.error = exc
+            self._dirty = True
+        self.latencies.append(time.perf_counter() - start)
+
+    def flush(self):
+        """Stop the worker and write whatever is still pending. Safe to call twice."""
+        if self._closed:
+            return
+        if not self._stop.is_set():
+            self._stop.set()
+            self._wake.set()
+            self._thread.join()
+        self._write()
+
+    def close(self):
+        """Flush for the last time; later flushes, the atexit one included, do nothing.
+
+        Call this before closing the storage that save writes to.
+        """
+        self.flush()
+        self._closed = True
+        atexit.unregister(self.flush)
+        log.info("Saved %s", self.report())
+        if self.error is not None and self._dirty:
+            log.error("Last save failed, changes since were not written: %r", self.error)
+
+    def report(self):
+        if not self.latencies:
+            return f"{self.requests} changes, nothing written"
+        latencies = sorted(self.latencies)
+        return (f"{self.requests} changes in {len(latencies)} writes, "
+                f"median {latencies[len(latencies) // 2] * 1000:.2f}ms, max {latencies[-1] * 1000:.2f}ms")